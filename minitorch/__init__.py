@@ -1,3 +1,5 @@
+import importlib
+
 from .tensor_data import *  # noqa: F401,F403
 from .tensor import *  # noqa: F401,F403
 from .tensor_ops import *  # noqa: F401,F403
@@ -6,3 +8,19 @@ from .operators import *  # noqa: F401,F403
 from .autodiff import *  # noqa: F401,F403
 from .scalar import *  # noqa: F401,F403
 from .module import *  # noqa: F401,F403
+from .data import *  # noqa: F401,F403
+from .serialization import save, load  # noqa: F401
+from .graph import Graph, capture  # noqa: F401
+from . import optim  # noqa: F401
+
+# The backends need numba, which takes longer to import than all of the above.
+# They are imported on first use of `minitorch.FastOps`, `minitorch.fast_ops`, ...
+_BACKENDS = {"FastOps": "fast_ops", "CudaOps": "cuda_ops"}
+
+
+def __getattr__(name):
+    if name in _BACKENDS:
+        return getattr(importlib.import_module("." + _BACKENDS[name], __name__), name)
+    if name in _BACKENDS.values():
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,18 @@
-import uuid
+import itertools
+import threading
+from contextlib import contextmanager
 from .utils import wrap_tuple, unwrap_tuple
 
+# Source of the unique ids of the variables. `next` on it is atomic.
+_variable_count = itertools.count()
+
 
 class Variable:
     """
     Attributes:
         history (:class:`History`) : the Function calls that created this variable or None if constant
         derivative (number): the derivative with respect to this variable
+        unique_id (int) : cheap identity of the variable, used by backpropagation
         name (string) : an optional name for debugging
     """
 
@@ -15,23 +21,36 @@ class Variable:
 
         self.history = history
         self._derivative = None
+        self.unique_id = next(_variable_count)
+
+        # For debugging can have a name, it is only created when it is read.
+        self._name = name
+
+    @property
+    def name(self):
+        if self._name is None:
+            self._name = "Variable" + str(self.unique_id)
+        return self._name
 
-        # For debugging can have a name.
-        if name is not None:
-            self.name = name
-        else:
-            self.name = str(uuid.uuid4())
+    @name.setter
+    def name(self, val):
+        self._name = val
 
     def requires_grad_(self, val):
-        self.history = History(None, None, None)
+        self.history = History(None, None, None) if val else None
 
-    def backward(self, d_output=None):
+    def backward(self, d_output=None, retain_graph=False):
         """
         Calls autodiff to fill in the derivatives for the history of this object.
+
+        Args:
+            d_output (number, optional): starting derivative to backpropagate
+            retain_graph (bool): keep the saved values and inputs of the graph,
+                which is needed to call backward through it again
         """
         if d_output is None:
             d_output = 1.0
-        backpropagate(VariableWithDeriv(self, d_output))
+        backpropagate(VariableWithDeriv(self, d_output), retain_graph=retain_graph)
 
     @property
     def derivative(self):
@@ -39,7 +58,7 @@ class Variable:
 
     ## IGNORE
     def __hash__(self):
-        return hash(self._name)
+        return hash(self.unique_id)
 
     def _add_deriv(self, val):
         assert self.history.is_leaf(), "Only leaf variables can have derivatives."
@@ -86,6 +105,40 @@ class Context:
         return unwrap_tuple(self._saved_values)
 
 
+# Shared by all Function calls that do not need a gradient, `save_for_backward`
+# is a no-op on it.
+_NO_GRAD_CONTEXT = Context(no_grad=True)
+
+# Whether Function calls record their history, per thread.
+_grad_mode = threading.local()
+
+
+def is_grad_enabled():
+    "Whether Function calls in this thread record the history for backward."
+    return getattr(_grad_mode, "enabled", True)
+
+
+@contextmanager
+def no_grad():
+    """
+    Context manager (or decorator) that disables the history tracking, e.g. for
+    evaluation and inference ::
+
+        with minitorch.no_grad():
+            out = model.forward(X)
+
+    Inside of it :func:`FunctionBase.apply` creates neither a :class:`Context`
+    nor a :class:`History`, nothing is saved for backward and the results are
+    constants.
+    """
+    previous = is_grad_enabled()
+    _grad_mode.enabled = False
+    try:
+        yield
+    finally:
+        _grad_mode.enabled = previous
+
+
 class History:
     """
     `History` stores all of the `Function` operations that were used to
@@ -108,6 +161,11 @@ class History:
     def backprop_step(self, d_output):
         return self.last_fn.chain_rule(self.ctx, self.inputs, d_output)
 
+    def release(self):
+        "Drop the saved values and the inputs once backward went through."
+        self.ctx = None
+        self.inputs = None
+
 
 class VariableWithDeriv:
     "Holder for a variable with it derivative."
@@ -134,16 +192,17 @@ class FunctionBase:
     def apply(cls, *vals):
         raw_vals = []
         need_grad = False
+        grad_enabled = is_grad_enabled()
         for v in vals:
             if isinstance(v, Variable):
-                if v.history is not None:
+                if grad_enabled and v.history is not None:
                     # if at least one of the values that is passed into the
                     # function has a history we neeed the grad
                     need_grad = True
                 raw_vals.append(v.get_data())
             else:
                 raw_vals.append(v)  # normal constants (e.g. 1.0, 2)
-        ctx = Context(not need_grad)
+        ctx = Context() if need_grad else _NO_GRAD_CONTEXT
         c = cls.forward(ctx, *raw_vals)
         assert isinstance(c, cls.data_type), "Expected return typ %s got %s" % (
             # The output has to correspond to the data-type the functiono is written
@@ -198,42 +257,79 @@ def is_constant(val):
     return not isinstance(val, Variable) or val.history is None
 
 
-def backpropagate(final_variable_with_deriv):
+def topological_sort(variable):
     """
-    Runs a breadth-first search on the computation graph in order to
-    backpropagate derivatives to the leaves.
+    Computes the topological order of the computation graph.
+
+    Args:
+        variable (:class:`Variable`): The right-most variable
+
+    Returns:
+        list of :class:`Variable`: Non-constant Variables in order, starting from
+        `variable` and ending with the leaves
+    """
+    order = []
+    visited = set()
+    # Iterative depth-first search, deep graphs would exceed the recursion limit.
+    # A variable is appended once all of its inputs have been appended.
+    stack = [(variable, False)]
+    while stack:
+        var, expanded = stack.pop()
+        if expanded:
+            order.append(var)
+            continue
+        if var.unique_id in visited:
+            continue
+        visited.add(var.unique_id)
+        stack.append((var, True))
+        if not var.history.is_leaf():
+            assert var.history.inputs is not None, (
+                "Trying to backward through the graph a second time, "
+                "use retain_graph=True in the first call."
+            )
+            for input in var.history.inputs:
+                if not is_constant(input) and input.unique_id not in visited:
+                    stack.append((input, False))
+    order.reverse()
+    return order
+
+
+def backpropagate(final_variable_with_deriv, retain_graph=False):
+    """
+    Runs backpropagation on the computation graph in topological order in
+    order to backpropagate derivatives to the leaves. Every variable is
+    processed once, after the derivatives of all the variables that use it
+    have been accumulated.
 
     See :doc:`backpropagate` for details on the algorithm
 
     Args:
        final_variable_with_deriv (:class:`VariableWithDeriv`): The final variable
            and its derivative that we want to propagate backward to the leaves.
-    Returns: 
-        None 
+       retain_graph (bool): If False, the history of every variable releases its
+           saved values and inputs as soon as it was processed, so the graph
+           can be freed during backward.
+    Returns:
+        None
         (It writes the results to the derivative values of each leaf)
     """
-    # We can implement the que using a list with append and pop
-    queue = list()
-    queue.append(final_variable_with_deriv)
-    # ATTENTION: Maybe need to take care of the 1 derivative for the final variable
-    # THe first ca
-
-    while queue:  # as long as there is something in the queue
-        var_with_deriv = queue.pop(0)
-        new_vars_with_deriv = var_with_deriv.variable.history.backprop_step(
-            var_with_deriv.deriv
-        )
-        for new_var_with_deriv in new_vars_with_deriv:
-            if is_leaf(new_var_with_deriv.variable):
-                new_var_with_deriv.variable._add_deriv(new_var_with_deriv.deriv)
+    final_variable = final_variable_with_deriv.variable
+    # derivatives accumulated so far, keyed by the unique id of the variable
+    derivs = {final_variable.unique_id: final_variable_with_deriv.deriv}
+
+    for var in topological_sort(final_variable):
+        deriv = derivs.pop(var.unique_id, None)
+        if deriv is None:
+            # backward returned no derivative for this variable
+            continue
+        if var.history.is_leaf():
+            var._add_deriv(deriv)
+            continue
+        for new_var_with_deriv in var.history.backprop_step(deriv):
+            key = new_var_with_deriv.variable.unique_id
+            if key in derivs:
+                derivs[key] = derivs[key] + new_var_with_deriv.deriv
             else:
-                var_already_in_queue = False
-                for vwd in queue:
-                    if vwd.variable.name == new_var_with_deriv.variable.name:
-                        vwd.deriv += new_var_with_deriv.deriv
-                        var_already_in_queue = True
-                        break
-
-                if not var_already_in_queue:
-                    queue.append(new_var_with_deriv)
-
+                derivs[key] = new_var_with_deriv.deriv
+        if not retain_graph:
+            var.history.release()
@@ -5,8 +5,10 @@ from .tensor_data import (
     index_to_position,
     broadcast_index,
     shape_broadcast,
+    promote_dtypes,
     MAX_DIMS,
 )
+from .graph import fill, launch
 import numpy
 import numpy as np
 
@@ -58,7 +60,7 @@ def map(fn):
         # Instantiate and run the cuda kernel.
         threadsperblock = 32
         blockspergrid = (out.size + (threadsperblock - 1)) // threadsperblock
-        f[blockspergrid, threadsperblock](*out.tuple(), out.size, *a.tuple())
+        launch(f[blockspergrid, threadsperblock], *out.tuple(), out.size, *a.tuple())
         return out
 
     return ret
@@ -109,13 +111,18 @@ def tensor_zip(fn):
 def zip(fn):
     f = tensor_zip(cuda.jit(device=True)(fn))
 
-    def ret(a, b):
-        c_shape = shape_broadcast(a.shape, b.shape)
-        out = a.zeros(c_shape)
+    def ret(a, b, out=None):
+        if out is None:
+            c_shape = shape_broadcast(a.shape, b.shape)
+            out = a.zeros(c_shape, promote_dtypes(a.dtype, b.dtype))
         threadsperblock = 32
         blockspergrid = (out.size + (threadsperblock - 1)) // threadsperblock
-        f[blockspergrid, threadsperblock](
-            *out.tuple(), out.size, *a.tuple(), *b.tuple()
+        launch(
+            f[blockspergrid, threadsperblock],
+            *out.tuple(),
+            out.size,
+            *a.tuple(),
+            *b.tuple(),
         )
         return out
 
@@ -170,7 +177,7 @@ def reduce(fn, start=0.0):
                 out_shape[d] = 1
             # Other values when not sum.
             out = a.zeros(tuple(out_shape))
-            out._tensor._storage[:] = start
+            launch(fill, out._tensor._storage, start)
         else:
             old_shape = out.shape
             diff = len(a.shape) - len(out.shape)
@@ -191,8 +198,13 @@ def reduce(fn, start=0.0):
 
         threadsperblock = 32
         blockspergrid = (out.size + (threadsperblock - 1)) // threadsperblock
-        f[blockspergrid, threadsperblock](
-            *out.tuple(), out.size, *a.tuple(), np.array(reduce_shape), reduce_size
+        launch(
+            f[blockspergrid, threadsperblock],
+            *out.tuple(),
+            out.size,
+            *a.tuple(),
+            np.array(reduce_shape),
+            reduce_size,
         )
         # START CODE CHANGE
         if old_shape is not None:
@@ -243,7 +255,7 @@ def tensor_matrix_multiply(
     raise NotImplementedError('Need to implement for Task 3.4')
 
 
-def matrix_multiply(a, b):
+def matrix_multiply(a, b, out=None):
     """
     Tensor matrix multiply
 
@@ -255,6 +267,8 @@ def matrix_multiply(a, b):
     Args:
         a (:class:`Tensor`): tensor a
         b (:class:`Tensor`): tensor b
+        out (:class:`Tensor`): optional, tensor of the result shape to fill
+               in, must not share storage with `a` or `b`
 
     Returns:
         :class:`Tensor` : new tensor
@@ -264,11 +278,17 @@ def matrix_multiply(a, b):
     ls.append(a.shape[-2])
     ls.append(b.shape[-1])
     assert a.shape[-1] == b.shape[-2]
-    out = a.zeros(tuple(ls))
+    if out is None:
+        out = a.zeros(tuple(ls), promote_dtypes(a.dtype, b.dtype))
+    assert out.shape == tuple(ls)
     threadsperblock = 32
     blockspergrid = (out.size + (threadsperblock - 1)) // threadsperblock
-    tensor_matrix_multiply[blockspergrid, threadsperblock](
-        *out.tuple(), out.size, *a.tuple(), *b.tuple()
+    launch(
+        tensor_matrix_multiply[blockspergrid, threadsperblock],
+        *out.tuple(),
+        out.size,
+        *a.tuple(),
+        *b.tuple(),
     )
 
     return out
@@ -0,0 +1,133 @@
+"""
+Mini-batch loading of tensor datasets.
+"""
+
+import queue
+import threading
+
+import numpy as np
+
+from .tensor import Tensor
+
+# Put by the prefetch thread after the last batch
+_END = object()
+
+
+class DataLoader:
+    """
+    Iterate over a dataset of tensors in mini-batches. ::
+
+        for x, y in DataLoader(X, y, batch_size=64, shuffle=True):
+            ...
+
+    The tensors share their first dimension, the examples, and every batch is
+    a tuple with a tensor of `batch_size` examples of each. Without shuffling
+    the batches are views of consecutive examples and nothing is copied. With
+    shuffling every epoch draws a new order and the examples of a batch are
+    gathered into new tensors.
+
+    With `prefetch` > 0 a background thread prepares the next batches while the
+    current one is used, e.g. gathers them or reads the pages of a memory
+    mapped dataset (see :func:`load_mmap`).
+
+    Attributes:
+        tensors (tuple of :class:`Tensor`): the dataset
+        batch_size (int): examples per batch
+        shuffle (bool): draw a new order of the examples every epoch
+        drop_last (bool): skip the last batch if it has less than `batch_size`
+            examples
+        prefetch (int): number of batches prepared ahead, 0 prepares them in
+            the loop
+    """
+
+    def __init__(
+        self,
+        *tensors,
+        batch_size=32,
+        shuffle=False,
+        drop_last=False,
+        prefetch=2,
+        generator=None,
+    ):
+        """
+        Args:
+            generator (:class:`numpy.random.Generator` or int): generator or
+                seed of the shuffling
+        """
+        assert tensors, "Needs at least one tensor"
+        self.size = tensors[0].shape[0]
+        assert all(
+            t.shape[0] == self.size for t in tensors
+        ), "Tensors must have the same number of examples"
+        assert batch_size > 0, "Batch size must be positive"
+        self.tensors = tensors
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self._generator = np.random.default_rng(generator)
+
+    def __len__(self):
+        "Number of batches per epoch"
+        if self.drop_last:
+            return self.size // self.batch_size
+        return (self.size + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        batches = self._batches()
+        if self.prefetch == 0:
+            return batches
+        return self._prefetched(batches)
+
+    def _batches(self):
+        order = self._generator.permutation(self.size) if self.shuffle else None
+        for i in range(len(self)):
+            start = i * self.batch_size
+            stop = min(start + self.batch_size, self.size)
+            if order is None:
+                yield tuple(t[start:stop] for t in self.tensors)
+            else:
+                index = order[start:stop]
+                yield tuple(
+                    Tensor.from_numpy(
+                        np.take(t.to_numpy(), index, axis=0), backend=t.backend
+                    )
+                    for t in self.tensors
+                )
+
+    def _prefetched(self, batches):
+        ready = queue.Queue(self.prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            # wait for space unless the loop over the batches was left
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def work():
+            try:
+                for batch in batches:
+                    if not put(batch):
+                        return
+                put(_END)
+            except Exception as error:
+                put(error)
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
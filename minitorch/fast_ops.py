@@ -1,12 +1,23 @@
+import dis
+import hashlib
+from types import CellType, CodeType, FunctionType, ModuleType
+
 import numpy as np
 from .tensor_data import (
     count,
     index_to_position,
     broadcast_index,
     shape_broadcast,
+    promote_dtypes,
     MAX_DIMS,
 )
-from numba import njit, prange
+from .graph import fill, launch
+from numba import njit, prange, config, from_dtype, float64, int64
+
+# Edge length of the square blocks the matrix multiply works on. Three
+# blocks of float64 fit into the L2 cache of common CPUs, the blocks have the
+# dtype of the output.
+TILE = 64
 
 
 # This code will JIT compile fast versions your tensor_data functions.
@@ -18,8 +29,270 @@ count = njit(inline="always")(count)
 index_to_position = njit(inline="always")(index_to_position)
 broadcast_index = njit(inline="always")(broadcast_index)
 
+# The helpers of tensor_data inlined into the kernels, numba does not track
+# changes of that file
+_HELPERS = (count, index_to_position, broadcast_index)
+
+
+# Compiled kernels are cached on disk (see `numba` caching, the location can be
+# set with NUMBA_CACHE_DIR) and loaded by later processes instead of compiled.
+# numba tracks changes of this file, and the kernels are keyed by the code of
+# their scalar functions and of the inlined helpers (see `jit_fn`).
+
+# numba compiles a specialization of every kernel per argument types, i.e.
+# per dtype of the tensors. Float32 tensors get float32 kernels that move half
+# the bytes of float64 ones.
+
+
+def tensor_types(dtype):
+    "numba types of the storage, shape and strides of a tensor as passed to kernels"
+    return (from_dtype(np.dtype(dtype))[::1], int64[::1], int64[::1])
+
+
+# One dispatcher per scalar function and one kernel per (factory, function)
+_jitted = {}
+_kernels = {}
+
+
+def jit_fn(fn):
+    """
+    Compile a scalar function with numba, once per function.
+
+    `fn` can be composed of other scalar functions, e.g. `operators.sigmoid_back`
+    calls `sigmoid`. The Python functions it calls are compiled as well and
+    numba inlines them, so a kernel runs the whole expression in one pass over
+    memory instead of one pass per operator.
+
+    Cached kernels are keyed by the pickled closure, which contains this
+    dispatcher. A dispatcher pickles with a random uuid, so it gets one derived
+    from the function name and a hash of its code, of the code of the
+    functions it calls and of the helpers the kernels inline instead. It is
+    the same in every process and changes with the code, numba only checks the
+    timestamp of this file.
+
+    Args:
+        fn: function on floats
+
+    Returns:
+        dispatcher : the compiled function
+    """
+    if fn not in _jitted:
+        resolved, callees = resolve_calls(fn)
+        jitted = njit()(resolved)
+        digest = code_digest(fn, callees)
+        jitted._set_uuid(f"minitorch:{fn.__module__}.{fn.__qualname__}:{digest}")
+        _jitted[fn] = jitted
+    return _jitted[fn]
+
+
+def code_digest(fn, callees):
+    """
+    Hash of the code of `fn`, of the values of its closure, of the uuids of
+    the compiled functions it calls and of the code of the tensor_data helpers
+    inlined into the kernels.
+
+    Args:
+        fn: function on floats
+        callees (list): dispatchers of the functions `fn` calls
+
+    Returns:
+        str : hex digest
+    """
+    digest = hashlib.sha256()
+
+    def add_code(code):
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                add_code(const)
+            else:
+                digest.update(repr(const).encode())
+
+    add_code(fn.__code__)
+    for helper in _HELPERS:
+        add_code(helper.py_func.__code__)
+    for cell in fn.__closure__ or ():
+        if not isinstance(cell.cell_contents, FunctionType):
+            digest.update(repr(cell.cell_contents).encode())
+    for callee in callees:
+        digest.update(callee._uuid.encode())
+    return digest.hexdigest()[:16]
+
+
+def resolve_calls(fn):
+    """
+    Replace the Python functions that `fn` calls through globals, attributes of
+    global modules (`operators.exp`) or its closure by their compiled versions,
+    numba can only call compiled functions.
+
+    Args:
+        fn: function on floats
+
+    Returns:
+        (function, list) : `fn` itself, or a copy with the calls resolved, and
+        the dispatchers of the functions it calls
+    """
+    calls = {}
+    callees = []
+    proxies = set()
+
+    def proxy(namespace, name):
+        "Stand-in for the module `namespace[name]` that can hold compiled functions."
+        if id(namespace[name]) not in proxies:
+            module = ModuleType(namespace[name].__name__)
+            module.__dict__.update(namespace[name].__dict__)
+            proxies.add(id(module))
+            namespace[name] = module
+        return namespace[name].__dict__
+
+    # chain of module attributes being loaded, e.g. ["minitorch", "operators"]
+    path = []
+    for ins in dis.get_instructions(fn):
+        value = None
+        if ins.opname == "LOAD_GLOBAL":
+            value = fn.__globals__.get(ins.argval)
+            if isinstance(value, FunctionType) and value is not fn:
+                calls[ins.argval] = jit_fn(value)
+                callees.append(calls[ins.argval])
+            path = [ins.argval]
+        elif ins.opname in ("LOAD_ATTR", "LOAD_METHOD") and path:
+            parent = fn.__globals__[path[0]]
+            for name in path[1:]:
+                parent = getattr(parent, name)
+            value = getattr(parent, ins.argval, None)
+            if isinstance(value, FunctionType):
+                calls.setdefault(path[0], fn.__globals__[path[0]])
+                namespace = calls
+                for name in path:
+                    namespace = proxy(namespace, name)
+                namespace[ins.argval] = jit_fn(value)
+                callees.append(namespace[ins.argval])
+            path = path + [ins.argval]
+        if not isinstance(value, ModuleType):
+            path = []
+    closure = fn.__closure__ or ()
+    cells = tuple(
+        CellType(jit_fn(c.cell_contents))
+        if isinstance(c.cell_contents, FunctionType)
+        else c
+        for c in closure
+    )
+    callees.extend(c.cell_contents for c in cells if c not in closure)
+    if not calls and cells == closure:
+        return fn, callees
+    resolved = FunctionType(
+        fn.__code__,
+        {**fn.__globals__, **calls},
+        fn.__name__,
+        fn.__defaults__,
+        cells or None,
+    )
+    resolved.__qualname__ = fn.__qualname__
+    return resolved, callees
+
+
+def kernel(factory, fn):
+    """
+    The disk cached kernel `factory(fn)`, created once per process.
+
+    Args:
+        factory: one of `tensor_map`, `tensor_zip` or `tensor_reduce`
+        fn: function on floats
+
+    Returns:
+        dispatcher : the compiled kernel
+    """
+    key = (factory, fn)
+    if key not in _kernels:
+        _kernels[key] = factory(jit_fn(fn), cache=True)
+    return _kernels[key]
+
+
+def warmup(dtypes=(np.float64,)):
+    """
+    Compile, or load from the on-disk cache, the kernels of every map, zip and
+    reduce created so far, of the matrix multiply and of the optimizer steps.
+    Call it after `make_tensor_backend(FastOps)` to move all compilation
+    before the first forward pass.
+
+    Args:
+        dtypes (tuple): dtypes to compile for, all tensors of a kernel call
+            having the same dtype
+    """
+    for dtype in dtypes:
+        tensor = tensor_types(dtype)
+        signatures = {
+            tensor_map: tensor * 2,
+            tensor_zip: tensor * 3,
+            tensor_reduce: tensor * 2 + (int64[::1], int64),
+        }
+        for (factory, _), compiled in _kernels.items():
+            compiled.compile(signatures[factory])
+        tensor_matrix_multiply.compile(tensor * 3)
+        flat = tensor[0]
+        sgd_update.compile((flat,) * 3 + (float64,) * 3)
+        adam_update.compile((flat,) * 4 + (float64,) * 5 + (int64,))
+
+
+@njit(inline="always")
+def same_layout(a_shape, a_strides, b_shape, b_strides):
+    """
+    Check whether two tensors have the same shape and strides. In that case
+    position `i` in the storage of one tensor holds the same index as position `i`
+    in the storage of the other, so kernels can skip the index arithmetic.
+    """
+    if len(a_shape) != len(b_shape):
+        return False
+    for i in range(len(a_shape)):
+        if a_shape[i] != b_shape[i] or a_strides[i] != b_strides[i]:
+            return False
+    return True
+
 
-def tensor_map(fn):
+@njit(inline="always")
+def shape_size(shape):
+    "Number of elements of a tensor, its storage can be longer for views"
+    size = 1
+    for i in range(len(shape)):
+        size *= shape[i]
+    return size
+
+
+@njit(inline="always")
+def is_dense(storage, shape, strides):
+    """
+    Check whether every storage position holds exactly one element, as for
+    contiguous and permuted tensors. Slices can skip positions of their storage
+    and broadcast views (stride 0) use positions more than once. Kernels can
+    only walk the storage directly instead of the indices of dense tensors.
+    """
+    for i in range(len(shape)):
+        if shape[i] > 1 and strides[i] == 0:
+            return False
+    return len(storage) == shape_size(shape)
+
+
+@njit(inline="always")
+def chunks(size, n_threads):
+    """
+    Split `size` positions into one contiguous chunk per thread.
+
+    The kernels pass the configured number of threads from their closure:
+    calling `get_num_threads` would keep them out of the disk cache, and the
+    closure is part of the cache key. With fewer threads set by
+    `set_num_threads`, a thread runs several chunks.
+
+    Returns:
+        (int, int) : number of chunks and positions per chunk
+    """
+    n_chunks = max(min(n_threads, size), 1)
+    chunk_size = max((size + n_chunks - 1) // n_chunks, 1)
+    # recount so that no chunk is empty
+    return (size + chunk_size - 1) // chunk_size, chunk_size
+
+
+def tensor_map(fn, cache=False):
     """
     NUMBA higher-order tensor map function. ::
 
@@ -28,6 +301,8 @@ def tensor_map(fn):
 
     Args:
         fn: function mappings floats-to-floats to apply.
+        cache (bool): cache the compiled kernel on disk, `fn` needs a stable
+            uuid (see `jit_fn`).
         out (array): storage for out tensor.
         out_shape (array): shape for out tensor.
         out_strides (array): strides for out tensor.
@@ -39,26 +314,41 @@ def tensor_map(fn):
         None : Fills in `out`
     """
 
-    def _map(out, out_shape, out_strides, in_storage, in_shape, in_strides):
-        in_indices = np.empty((len(out), len(in_shape)), dtype=np.int32)
-        out_indices = np.empty((len(out), len(out_shape)), dtype=np.int32)
-
-        for i in prange(len(out)):
-            count(i, out_shape, out_indices[i])
-            # now we map the broadcasted index to the input index
-            broadcast_index(
-                big_index=out_indices[i],
-                big_shape=out_shape,
-                shape=in_shape,
-                out_index=in_indices[i],
-            )
+    n_threads = config.NUMBA_NUM_THREADS
 
-            # now we map the index to the position
-            in_position = index_to_position(in_indices[i], in_strides)
-            out_position = index_to_position(out_indices[i], out_strides)
-            out[out_position] = fn(in_storage[in_position])
-
-    return njit(parallel=True)(_map)
+    def _map(out, out_shape, out_strides, in_storage, in_shape, in_strides):
+        size = shape_size(out_shape)
+        # Fast path: no broadcasting and identical dense layout, walk the storage
+        # directly
+        if is_dense(out, out_shape, out_strides) and same_layout(
+            out_shape, out_strides, in_shape, in_strides
+        ):
+            for i in prange(size):
+                out[i] = fn(in_storage[i])
+            return
+
+        # Each chunk of positions gets its own index buffers, so the scratch
+        # memory is O(threads x dims) instead of O(size x dims)
+        n_chunks, chunk_size = chunks(size, n_threads)
+        for c in prange(n_chunks):
+            in_index = np.empty(len(in_shape), dtype=np.int32)
+            out_index = np.empty(len(out_shape), dtype=np.int32)
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, size)):
+                count(i, out_shape, out_index)
+                # now we map the broadcasted index to the input index
+                broadcast_index(
+                    big_index=out_index,
+                    big_shape=out_shape,
+                    shape=in_shape,
+                    out_index=in_index,
+                )
+
+                # now we map the index to the position
+                in_position = index_to_position(in_index, in_strides)
+                out_position = index_to_position(out_index, out_strides)
+                out[out_position] = fn(in_storage[in_position])
+
+    return njit(parallel=True, cache=cache)(_map)
 
 
 def map(fn):
@@ -79,19 +369,18 @@ def map(fn):
         :class:`Tensor` : new tensor
     """
 
-    # This line JIT compiles your tensor_map
-    f = tensor_map(njit()(fn))
+    f = kernel(tensor_map, fn)
 
     def ret(a, out=None):
         if out is None:
             out = a.zeros(a.shape)
-        f(*out.tuple(), *a.tuple())
+        launch(f, *out.tuple(), *a.tuple())
         return out
 
     return ret
 
 
-def tensor_zip(fn):
+def tensor_zip(fn, cache=False):
     """
     NUMBA higher-order tensor zipWith (or map2) function ::
 
@@ -100,6 +389,8 @@ def tensor_zip(fn):
 
     Args:
         fn: function maps two floats to float to apply.
+        cache (bool): cache the compiled kernel on disk, `fn` needs a stable
+            uuid (see `jit_fn`).
         out (array): storage for `out` tensor.
         out_shape (array): shape for `out` tensor.
         out_strides (array): strides for `out` tensor.
@@ -114,6 +405,8 @@ def tensor_zip(fn):
         None : Fills in `out`
     """
 
+    n_threads = config.NUMBA_NUM_THREADS
+
     def _zip(
         out,
         out_shape,
@@ -125,29 +418,63 @@ def tensor_zip(fn):
         b_shape,
         b_strides,
     ):
-        a_indices = np.empty((len(out), len(a_shape)), dtype=np.int32)
-        b_indices = np.empty((len(out), len(b_shape)), dtype=np.int32)
-        out_indices = np.empty((len(out), len(out_shape)), dtype=np.int32)
-        for i in prange(len(out)):
-            count(i, out_shape, out_indices[i])
-            broadcast_index(
-                big_index=out_indices[i],
-                big_shape=out_shape,
-                shape=a_shape,
-                out_index=a_indices[i],
-            )
-            broadcast_index(
-                big_index=out_indices[i],
-                big_shape=out_shape,
-                shape=b_shape,
-                out_index=b_indices[i],
-            )
-            b_position = index_to_position(b_indices[i], b_strides)
-            a_position = index_to_position(a_indices[i], a_strides)
-            out_position = index_to_position(out_indices[i], out_strides)
-            out[out_position] = fn(a_storage[a_position], b_storage[b_position])
-
-    return njit(parallel=True)(_zip)
+        size = shape_size(out_shape)
+        dense = is_dense(out, out_shape, out_strides)
+        # Fast path: no broadcasting and identical dense layout, walk the storage
+        # directly
+        if (
+            dense
+            and same_layout(out_shape, out_strides, a_shape, a_strides)
+            and same_layout(out_shape, out_strides, b_shape, b_strides)
+        ):
+            for i in prange(size):
+                out[i] = fn(a_storage[i], b_storage[i])
+            return
+        # Fast paths for a single value broadcast against a tensor, as in `x * 2.0`
+        if (
+            dense
+            and len(b_storage) == 1
+            and same_layout(out_shape, out_strides, a_shape, a_strides)
+        ):
+            b = b_storage[0]
+            for i in prange(size):
+                out[i] = fn(a_storage[i], b)
+            return
+        if (
+            dense
+            and len(a_storage) == 1
+            and same_layout(out_shape, out_strides, b_shape, b_strides)
+        ):
+            a = a_storage[0]
+            for i in prange(size):
+                out[i] = fn(a, b_storage[i])
+            return
+
+        n_chunks, chunk_size = chunks(size, n_threads)
+        for c in prange(n_chunks):
+            a_index = np.empty(len(a_shape), dtype=np.int32)
+            b_index = np.empty(len(b_shape), dtype=np.int32)
+            out_index = np.empty(len(out_shape), dtype=np.int32)
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, size)):
+                count(i, out_shape, out_index)
+                broadcast_index(
+                    big_index=out_index,
+                    big_shape=out_shape,
+                    shape=a_shape,
+                    out_index=a_index,
+                )
+                broadcast_index(
+                    big_index=out_index,
+                    big_shape=out_shape,
+                    shape=b_shape,
+                    out_index=b_index,
+                )
+                b_position = index_to_position(b_index, b_strides)
+                a_position = index_to_position(a_index, a_strides)
+                out_position = index_to_position(out_index, out_strides)
+                out[out_position] = fn(a_storage[a_position], b_storage[b_position])
+
+    return njit(parallel=True, cache=cache)(_zip)
 
 
 def zip(fn):
@@ -161,27 +488,32 @@ def zip(fn):
         fn: function from two floats-to-float to apply
         a (:class:`Tensor`): tensor to zip over
         b (:class:`Tensor`): tensor to zip over
+        out (:class:`Tensor`): optional, tensor to fill in, `a` and `b` should
+               broadcast to its shape. Can be `a` or `b` itself.
 
     Returns:
         :class:`Tensor` : new tensor
     """
-    f = tensor_zip(njit()(fn))
+    f = kernel(tensor_zip, fn)
 
-    def ret(a, b):
-        c_shape = shape_broadcast(a.shape, b.shape)
-        out = a.zeros(c_shape)
-        f(*out.tuple(), *a.tuple(), *b.tuple())
+    def ret(a, b, out=None):
+        if out is None:
+            c_shape = shape_broadcast(a.shape, b.shape)
+            out = a.zeros(c_shape, promote_dtypes(a.dtype, b.dtype))
+        launch(f, *out.tuple(), *a.tuple(), *b.tuple())
         return out
 
     return ret
 
 
-def tensor_reduce(fn):
+def tensor_reduce(fn, cache=False):
     """
     NUMBA higher-order tensor reduce function.
 
     Args:
         fn: reduction function mapping two floats to float.
+        cache (bool): cache the compiled kernel on disk, `fn` needs a stable
+            uuid (see `jit_fn`).
         out (array): storage for `out` tensor.
         out_shape (array): shape for `out` tensor.
         out_strides (array): strides for `out` tensor.
@@ -196,6 +528,8 @@ def tensor_reduce(fn):
 
     """
 
+    n_threads = config.NUMBA_NUM_THREADS
+
     def _reduce(
         out,
         out_shape,
@@ -206,13 +540,71 @@ def tensor_reduce(fn):
         reduce_shape,
         reduce_size,
     ):
-        a_indices = np.empty((len(out), len(a_shape)), dtype=np.int32)
-        out_indices = np.empty((len(out), len(out_shape)), dtype=np.int32)
-        for i in prange(len(out)): 
-            # as long as the reduced function is commutative we can even parallelize
-            # the inner loop
-
-    return njit(parallel=True)(_reduce)
+        if reduce_size == 0:
+            # nothing to reduce, `out` holds the start value
+            return
+        # The inner loop walks the reduced dim with the most elements with a
+        # fixed stride, the outer loop enumerates the remaining reduced dims.
+        reduce_dim = 0
+        for d in range(len(reduce_shape)):
+            if reduce_shape[d] > reduce_shape[reduce_dim]:
+                reduce_dim = d
+        reduce_len = reduce_shape[reduce_dim]
+        reduce_stride = a_strides[reduce_dim]
+        outer_shape = reduce_shape.copy()
+        outer_shape[reduce_dim] = 1
+        outer_size = reduce_size // reduce_len
+
+        size = shape_size(out_shape)
+        if size == 1:
+            # Reduction to a single value: every chunk computes a partial result
+            # that is combined with `out` at the end, so all threads are used.
+            n_chunks, chunk_size = chunks(reduce_size, n_threads)
+            partials = np.empty(n_chunks)
+            if is_dense(a_storage, a_shape, a_strides):
+                # every storage position is an element of `a`, the order
+                # does not matter
+                for c in prange(n_chunks):
+                    start = c * chunk_size
+                    acc = a_storage[start]
+                    for i in range(start + 1, min(start + chunk_size, reduce_size)):
+                        acc = fn(acc, a_storage[i])
+                    partials[c] = acc
+            else:
+                for c in prange(n_chunks):
+                    a_index = np.empty(len(a_shape), dtype=np.int32)
+                    start = c * chunk_size
+                    count(start, a_shape, a_index)
+                    acc = a_storage[index_to_position(a_index, a_strides)]
+                    for i in range(start + 1, min(start + chunk_size, reduce_size)):
+                        count(i, a_shape, a_index)
+                        acc = fn(acc, a_storage[index_to_position(a_index, a_strides)])
+                    partials[c] = acc
+            acc = out[0]
+            for c in range(n_chunks):
+                acc = fn(acc, partials[c])
+            out[0] = acc
+            return
+
+        n_chunks, chunk_size = chunks(size, n_threads)
+        for c in prange(n_chunks):
+            out_index = np.empty(len(out_shape), dtype=np.int32)
+            outer_index = np.empty(len(out_shape), dtype=np.int32)
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, size)):
+                count(i, out_shape, out_index)
+                out_pos = index_to_position(out_index, out_strides)
+                # out_index is 0 in the reduced dims, so this is the position of
+                # the first reduced element
+                base = index_to_position(out_index, a_strides)
+                acc = out[out_pos]
+                for j in range(outer_size):
+                    count(j, outer_shape, outer_index)
+                    pos = base + index_to_position(outer_index, a_strides)
+                    for k in range(reduce_len):
+                        acc = fn(acc, a_storage[pos + k * reduce_stride])
+                out[out_pos] = acc
+
+    return njit(parallel=True, cache=cache)(_reduce)
 
 
 def reduce(fn, start=0.0):
@@ -233,7 +625,7 @@ def reduce(fn, start=0.0):
         :class:`Tensor` : new tensor
     """
 
-    f = tensor_reduce(njit()(fn))
+    f = kernel(tensor_reduce, fn)
 
     def ret(a, dims=None, out=None):
         old_shape = None
@@ -243,7 +635,7 @@ def reduce(fn, start=0.0):
                 out_shape[d] = 1
             # Other values when not sum.
             out = a.zeros(tuple(out_shape))
-            out._tensor._storage[:] = start
+            launch(fill, out._tensor._storage, start)
         else:
             old_shape = out.shape
             diff = len(a.shape) - len(out.shape)
@@ -263,7 +655,7 @@ def reduce(fn, start=0.0):
                 reduce_shape.append(1)
 
         # Apply
-        f(*out.tuple(), *a.tuple(), np.array(reduce_shape), reduce_size)
+        launch(f, *out.tuple(), *a.tuple(), np.array(reduce_shape), reduce_size)
 
         if old_shape is not None:
             out = out.view(*old_shape)
@@ -272,7 +664,7 @@ def reduce(fn, start=0.0):
     return ret
 
 
-@njit(parallel=True)
+@njit(parallel=True, cache=True)
 def tensor_matrix_multiply(
     out,
     out_shape,
@@ -306,11 +698,77 @@ def tensor_matrix_multiply(
         None : Fills in `out`
     """
 
-    # TODO: Implement for Task 3.2.
-    raise NotImplementedError("Need to implement for Task 3.2")
-
-
-def matrix_multiply(a, b):
+    dims = len(out_shape)
+    a_dif = dims - len(a_shape)
+    b_dif = dims - len(b_shape)
+    rows = out_shape[dims - 2]
+    cols = out_shape[dims - 1]
+    inner = a_shape[len(a_shape) - 1]
+
+    n_batches = 1
+    for d in range(dims - 2):
+        n_batches *= out_shape[d]
+    row_tiles = (rows + TILE - 1) // TILE
+
+    # Every job computes one tile of rows of one matrix in the batch.
+    for job in prange(n_batches * row_tiles):
+        batch = job // row_tiles
+        i0 = (job % row_tiles) * TILE
+        i1 = min(i0 + TILE, rows)
+
+        # Storage offset of this matrix in out, a and b. The leading dims of
+        # a and b are broadcast to the ones of out.
+        out_start = 0
+        a_start = 0
+        b_start = 0
+        rest = batch
+        for d in range(dims - 3, -1, -1):
+            idx = rest % out_shape[d]
+            rest = rest // out_shape[d]
+            out_start += idx * out_strides[d]
+            if d >= a_dif and a_shape[d - a_dif] != 1:
+                a_start += idx * a_strides[d - a_dif]
+            if d >= b_dif and b_shape[d - b_dif] != 1:
+                b_start += idx * b_strides[d - b_dif]
+
+        # Tiles are packed into contiguous buffers so the innermost loop has
+        # unit stride whatever the strides of a and b are.
+        a_tile = np.empty((min(TILE, rows), min(TILE, inner)), out.dtype)
+        b_tile = np.empty((min(TILE, inner), min(TILE, cols)), out.dtype)
+        acc = np.empty((min(TILE, rows), min(TILE, cols)), out.dtype)
+        for j0 in range(0, cols, TILE):
+            j1 = min(j0 + TILE, cols)
+            acc[:] = 0.0
+            for k0 in range(0, inner, TILE):
+                k1 = min(k0 + TILE, inner)
+                for i in range(i0, i1):
+                    for k in range(k0, k1):
+                        a_tile[i - i0, k - k0] = a_storage[
+                            a_start
+                            + i * a_strides[len(a_shape) - 2]
+                            + k * a_strides[len(a_shape) - 1]
+                        ]
+                for k in range(k0, k1):
+                    for j in range(j0, j1):
+                        b_tile[k - k0, j - j0] = b_storage[
+                            b_start
+                            + k * b_strides[len(b_shape) - 2]
+                            + j * b_strides[len(b_shape) - 1]
+                        ]
+                for i in range(i1 - i0):
+                    acc_row = acc[i]
+                    for k in range(k1 - k0):
+                        x = a_tile[i, k]
+                        b_row = b_tile[k]
+                        for j in range(j1 - j0):
+                            acc_row[j] += x * b_row[j]
+            for i in range(i0, i1):
+                row = out_start + i * out_strides[dims - 2]
+                for j in range(j0, j1):
+                    out[row + j * out_strides[dims - 1]] = acc[i - i0, j - j0]
+
+
+def matrix_multiply(a, b, out=None):
     """
     Tensor matrix multiply
 
@@ -322,6 +780,8 @@ def matrix_multiply(a, b):
     Args:
         a (:class:`Tensor`): tensor a
         b (:class:`Tensor`): tensor b
+        out (:class:`Tensor`): optional, tensor of the result shape to fill
+               in, must not share storage with `a` or `b`
 
     Returns:
         :class:`Tensor` : new tensor
@@ -334,15 +794,45 @@ def matrix_multiply(a, b):
     ls.append(b.shape[-1])
     assert a.shape[-1] == b.shape[-2]
     # END CODE CHANGE
-    out = a.zeros(tuple(ls))
+    if out is None:
+        out = a.zeros(tuple(ls), promote_dtypes(a.dtype, b.dtype))
+    assert out.shape == tuple(ls)
 
     # Call main function
-    tensor_matrix_multiply(*out.tuple(), *a.tuple(), *b.tuple())
+    launch(tensor_matrix_multiply, *out.tuple(), *a.tuple(), *b.tuple())
     return out
 
 
+# The optimizer steps run the whole update of every parameter in one pass over
+# the flat buffers, see `tensor_ops.sgd_update` and `tensor_ops.adam_update`.
+
+
+@njit(parallel=True, cache=True)
+def sgd_update(values, grads, velocity, lr, momentum, weight_decay):
+    for i in prange(len(values)):
+        g = grads[i] + weight_decay * values[i]
+        if momentum != 0.0:
+            g += momentum * velocity[i]
+            velocity[i] = g
+        values[i] -= lr * g
+
+
+@njit(parallel=True, cache=True)
+def adam_update(values, grads, m, v, lr, beta1, beta2, eps, weight_decay, step):
+    step_size = lr / (1 - beta1 ** step)
+    bias2 = np.sqrt(1 - beta2 ** step)
+    for i in prange(len(values)):
+        g = grads[i] + weight_decay * values[i]
+        m[i] = beta1 * m[i] + (1 - beta1) * g
+        v[i] = beta2 * v[i] + (1 - beta2) * g * g
+        values[i] -= step_size * m[i] / (np.sqrt(v[i]) / bias2 + eps)
+
+
 class FastOps:
     map = map
     zip = zip
     reduce = reduce
     matrix_multiply = matrix_multiply
+    warmup = warmup
+    sgd_update = sgd_update
+    adam_update = adam_update
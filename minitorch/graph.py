@@ -0,0 +1,126 @@
+"""
+Capture of the kernels of a function on tensors, e.g. a training step, to
+replay them without running the function again.
+"""
+
+import threading
+
+from .autodiff import no_grad
+
+# The list of ops recorded in this thread while a graph is captured, else None
+_capturing = threading.local()
+
+
+def launch(kernel, *args):
+    """
+    Run `kernel(*args)`, an op writing to tensor storage. While a graph is
+    captured in this thread (see :func:`capture`) the op is also recorded. All
+    ops of the tensor functions, of backward and of the optimizers go through
+    here.
+    """
+    record(kernel, *args)
+    kernel(*args)
+
+
+def record(kernel, *args):
+    """
+    Record `kernel(*args)` without running it, for effects that happened
+    otherwise, e.g. the zeros of a new buffer that a kernel accumulates into.
+    """
+    ops = getattr(_capturing, "ops", None)
+    if ops is not None:
+        ops.append((kernel, args))
+
+
+def fill(storage, value):
+    "Set all values of `storage` to `value`"
+    storage[:] = value
+
+
+class Graph:
+    """
+    The ops of one call of a function, replayed on new values of its inputs,
+    see :func:`capture`. A replay copies the inputs into the captured ones and
+    runs the recorded kernels on the buffers of the captured call. It runs no
+    Python code of the function, creates no :class:`History` for backward and
+    allocates nothing.
+
+    Attributes:
+        inputs (tuple of :class:`Tensor`): the captured inputs
+        outputs: what the function returned, its tensors hold the results of
+            the last replay
+    """
+
+    def __init__(self, ops, inputs, outputs):
+        self.ops = ops
+        self.inputs = inputs
+        self.outputs = outputs
+
+    def __call__(self, *inputs):
+        """
+        Replay the captured call on `inputs`.
+
+        Args:
+            inputs (:class:`Tensor`): tensors of the shapes of the captured inputs
+
+        Returns:
+            the outputs of the captured call, overwritten by the next replay
+        """
+        assert len(inputs) == len(self.inputs), "Needs the captured inputs"
+        for captured, x in zip(self.inputs, inputs):
+            if x is not captured:
+                assert (
+                    x.shape == captured.shape
+                ), f"Captured for shape {captured.shape}, got {x.shape}"
+                captured.backend._id_map(x, out=captured)
+        for kernel, args in self.ops:
+            kernel(*args)
+        return self.outputs
+
+
+def capture(fn, *inputs, warmup=1):
+    """
+    Capture the kernels of `fn(*inputs)` to replay them on other inputs of the
+    same shapes. ::
+
+        def train_step(x, y):
+            loss = ...
+            loss.backward()
+            optimizer.step()
+            optimizer.zero_grad()
+            return loss
+
+        step = minitorch.capture(train_step, x, y)
+        for x, y in loader:
+            loss = step(x, y)
+
+    Only the ops writing to tensor storage are replayed, so `fn` must run the
+    same ops for all values of the inputs, e.g. no Python branch on a value of
+    a tensor, and everything changing between calls must be an input or kept
+    by an op, like the step count of :class:`optim.Adam`. Python values
+    computed in `fn`, e.g. `loss[0]`, are not updated by a replay.
+
+    Args:
+        fn: function of tensors
+        inputs (:class:`Tensor`): example inputs, copied into the captured
+            inputs
+        warmup (int): number of calls before the captured one, e.g. to create
+            the gradient buffers. All calls are real, e.g. training steps on
+            the example inputs.
+
+    Returns:
+        :class:`Graph` : the captured call
+    """
+    assert getattr(_capturing, "ops", None) is None, "Already capturing a graph"
+    with no_grad():
+        # private copies, replays write to them
+        inputs = tuple(x.contiguous() for x in inputs)
+    for _ in range(warmup):
+        fn(*inputs)
+    ops = []
+    _capturing.ops = ops
+    try:
+        outputs = fn(*inputs)
+    finally:
+        _capturing.ops = None
+    return Graph(ops, inputs, outputs)
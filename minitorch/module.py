@@ -1,19 +1,30 @@
 ## Task 0.4
 ## Modules
 
+from .optim import flatten_parameters
+from .tensor import Tensor
+from .tensor_data import TensorData
+
 
 class Module:
     """
     Attributes:
         _modules (dict of name x :class:`Module`): Storage of the child modules
         _parameters (dict of name x :class:`Parameter`): Storage of the module's parameters
+        _registry (tuple): Generation and cached :meth:`named_parameters`
         mode (string): Mode of operation, can be {"train", "eval"}.
 
     """
 
+    # Counts the changes of the parameters and child modules of all modules.
+    # A module can be the child of several others, so instead of invalidating
+    # the registries of its ancestors a change makes every registry older.
+    _generation = 0
+
     def __init__(self):
         self._modules = {}
         self._parameters = {}
+        self._registry = None
         self.mode = "train"
 
     def modules(self):
@@ -45,10 +56,77 @@ class Module:
         Returns:
             dict: Each name (key) and :class:`Parameter` (value) under this module.
         """
-        return traverse(self, {}, "")
+        return dict(self._named_parameters())
 
     def parameters(self):
-        return self.named_parameters().values()
+        return self._named_parameters().values()
+
+    def _named_parameters(self):
+        # traversed again only after a parameter or module was set somewhere
+        registry = self.__dict__["_registry"]
+        if registry is None or registry[0] != Module._generation:
+            registry = (Module._generation, traverse(self, {}, ""))
+            self.__dict__["_registry"] = registry
+        return registry[1]
+
+    def flat_parameters(self):
+        """
+        Move the tensor parameters of this module and its descendents into one
+        contiguous storage (see :func:`minitorch.optim.flatten_parameters`).
+        The parameters become views of slices of it and their gradients slices
+        of its gradient, so an op over the whole model is one kernel, e.g.
+        `flat.zero_grad_()` or `(flat.grad * flat.grad).sum()`. Optimizers of
+        the parameters use the same storage.
+
+        Returns:
+            :class:`Tensor`: The values of all parameters, in the order of
+            :meth:`parameters`.
+        """
+        tensors = [p.value for p in dict.fromkeys(self.parameters())]
+        assert tensors and all(
+            isinstance(t, Tensor) for t in tensors
+        ), "Needs tensor parameters"
+        values, grads = flatten_parameters(tensors)
+        flat = tensors[0]._new(TensorData(values, (len(values),)))
+        flat._derivative = flat._new(TensorData(grads, (len(grads),)))
+        return flat
+
+    def state_dict(self):
+        """
+        The values of the parameters of this module and its descendents, e.g.
+        to write them with :func:`minitorch.save`. The values are not copied.
+
+        Returns:
+            dict: Each name (key) and parameter value under this module.
+        """
+        return {k: p.value for k, p in self._named_parameters().items()}
+
+    def load_state_dict(self, state, strict=True):
+        """
+        Use the values of a :meth:`state_dict`, e.g. read with
+        :func:`minitorch.load`. Tensors are not copied, the parameters use
+        their storage with the backend of the values they replace.
+
+        Args:
+            state (dict): Each name (key) and parameter value.
+            strict (bool): The names must be those of the parameters.
+        """
+        parameters = self._named_parameters()
+        if strict:
+            assert set(state) == set(parameters), (
+                f"Missing {sorted(set(parameters) - set(state))}, "
+                f"unexpected {sorted(set(state) - set(parameters))}"
+            )
+        for k, value in state.items():
+            if k not in parameters:
+                continue
+            p = parameters[k]
+            if isinstance(p.value, Tensor) and isinstance(value, Tensor):
+                assert (
+                    value.shape == p.value.shape
+                ), f"{k} has shape {value.shape}, expected {p.value.shape}"
+                value = Tensor(value._tensor, backend=p.value.backend)
+            p.update(value)
 
     def add_parameter(self, k, v):
         """
@@ -63,13 +141,16 @@ class Module:
         """
         val = Parameter(v)
         self.__dict__["_parameters"][k] = val
+        Module._generation += 1
         return val
 
     def __setattr__(self, key, val):
         if isinstance(val, Parameter):
             self.__dict__["_parameters"][key] = val
+            Module._generation += 1
         elif isinstance(val, Module):
             self.__dict__["_modules"][key] = val
+            Module._generation += 1
         else:
             super().__setattr__(key, val)
 
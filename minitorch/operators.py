@@ -20,6 +20,11 @@ def add(x, y):
     return x + y
 
 
+def sub(x, y):
+    ":math:`f(x, y) = x - y`"
+    return x - y
+
+
 def neg(x):
     ":math:`f(x) = -x`"
     return -x
@@ -112,7 +117,8 @@ def inv_back(a, b):
 
 
 def sigmoid_back(a, b):
-    return sigmoid(a) * (1 - sigmoid(a)) * b
+    s = sigmoid(a)
+    return s * (1.0 - s) * b
 
 
 def exp_back(a, b):
@@ -0,0 +1,199 @@
+"""
+Optimizers updating the tensor parameters of a :class:`Module`.
+"""
+
+import numpy as np
+
+from .graph import fill, launch
+from .tensor import Tensor
+from .tensor_data import TensorData, strides_from_shape
+
+
+def _flat_buffer(datas):
+    "The 1-D array of which `datas` are consecutive dense slices, else None"
+    base = datas[0]._storage.base
+    if not isinstance(base, np.ndarray) or base.ndim != 1:
+        return None
+    address = base.ctypes.data
+    offset = 0
+    for d in datas:
+        storage = d._storage
+        if (
+            storage.base is not base
+            or len(storage) != d.size
+            or storage.strides != (base.itemsize,)
+            or storage.ctypes.data != address + offset * base.itemsize
+            or d.strides != strides_from_shape(d.shape)
+        ):
+            return None
+        offset += d.size
+    return base if offset == len(base) else None
+
+
+def flatten_parameters(tensors):
+    """
+    Move the values and the gradients of tensors into two contiguous buffers.
+    Every tensor keeps its identity, its storage becomes a slice of the values
+    buffer and its gradient a slice of the gradients buffer, which backward
+    accumulates into in place. Code holding the previous storage, e.g. an
+    array given to :func:`from_numpy`, no longer shares it with the tensor.
+    Tensors already moved together, in the same order, keep their buffers.
+
+    Args:
+        tensors (list of :class:`Tensor`): tensors of the same dtype
+
+    Returns:
+        (array, array) : flat values and flat gradients
+    """
+    if all(t._derivative is not None for t in tensors):
+        values = _flat_buffer([t._tensor for t in tensors])
+        grads = _flat_buffer([t._derivative._tensor for t in tensors])
+        if values is not None and grads is not None:
+            return values, grads
+
+    dtype = tensors[0].dtype
+    assert all(t.dtype == dtype for t in tensors), "Parameters must have one dtype"
+    size = sum(t.size for t in tensors)
+    values = np.empty(size, dtype)
+    grads = np.zeros(size, dtype)
+    offset = 0
+    for t in tensors:
+        end = offset + t.size
+        values[offset:end] = t.to_numpy().reshape(-1)
+        if t._derivative is not None:
+            grads[offset:end] = t._derivative.to_numpy().reshape(-1)
+        t._tensor = TensorData(values[offset:end], t.shape)
+        t._derivative = t._new(TensorData(grads[offset:end], t.shape))
+        offset = end
+    return values, grads
+
+
+class Optimizer:
+    """
+    Base class of the optimizers. The values and gradients of the parameters
+    live in flat buffers (see :func:`flatten_parameters`), so a step is one
+    kernel over all parameters and `zero_grad` one fill.
+
+    Attributes:
+        parameters (list of :class:`Parameter`): parameters holding tensors
+            of one backend and dtype
+    """
+
+    # Name of the update kernel on the backend, see `make_tensor_backend`
+    kernel = None
+
+    def __init__(self, parameters):
+        # a parameter shared by several modules is updated once
+        self.parameters = list(dict.fromkeys(parameters))
+        assert self.parameters, "Needs at least one parameter"
+        assert all(
+            isinstance(p.value, Tensor) for p in self.parameters
+        ), "Optimizers update tensor parameters"
+        backend = self.parameters[0].value.backend
+        if self.kernel is not None and getattr(backend, self.kernel) is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} needs tensor ops with "
+                f"`{self.kernel.lstrip('_')}`, the backend has none"
+            )
+        self._flatten()
+
+    def _flatten(self):
+        self._tensors = [p.value for p in self.parameters]
+        self.backend = self._tensors[0].backend
+        self._values, self._grads = flatten_parameters(self._tensors)
+        self._layout = [(t._tensor, t._derivative) for t in self._tensors]
+
+    def _sync(self):
+        # flatten again if a parameter was replaced, e.g. by `Parameter.update`,
+        # the optimizer state of each position stays
+        for p, t, (data, grad) in zip(self.parameters, self._tensors, self._layout):
+            if p.value is not t or t._tensor is not data or t._derivative is not grad:
+                size = len(self._values)
+                self._flatten()
+                assert len(self._values) == size, "Parameter sizes changed"
+                return
+
+    def zero_grad(self):
+        "Reset the gradients of all parameters to zero"
+        self._sync()
+        launch(fill, self._grads, 0.0)
+
+    def step(self):
+        "Update all parameters with their gradients"
+        self._sync()
+        # a graph replays the update with the hyperparameters at that time
+        launch(self._update)
+
+    def _update(self):
+        raise NotImplementedError
+
+
+class SGD(Optimizer):
+    """
+    Stochastic gradient descent with momentum and weight decay.
+
+    Attributes:
+        lr (float): learning rate
+        momentum (float): momentum factor, 0 for plain SGD
+        weight_decay (float): L2 penalty factor
+    """
+
+    kernel = "_sgd_update"
+
+    def __init__(self, parameters, lr, momentum=0.0, weight_decay=0.0):
+        super().__init__(parameters)
+        self.lr = lr
+        self.momentum = momentum
+        self.weight_decay = weight_decay
+        self._velocity = np.zeros(len(self._values), self._values.dtype)
+
+    def _update(self):
+        self.backend._sgd_update(
+            self._values,
+            self._grads,
+            self._velocity,
+            float(self.lr),
+            float(self.momentum),
+            float(self.weight_decay),
+        )
+
+
+class Adam(Optimizer):
+    """
+    Adam, with the first and second moments of the gradients.
+
+    Attributes:
+        lr (float): learning rate
+        betas (tuple): decays of the first and second moments
+        eps (float): added to the denominator for numerical stability
+        weight_decay (float): L2 penalty factor
+    """
+
+    kernel = "_adam_update"
+
+    def __init__(
+        self, parameters, lr=1e-3, betas=(0.9, 0.999), eps=1e-8, weight_decay=0.0
+    ):
+        super().__init__(parameters)
+        self.lr = lr
+        self.betas = betas
+        self.eps = eps
+        self.weight_decay = weight_decay
+        self._m = np.zeros(len(self._values), self._values.dtype)
+        self._v = np.zeros(len(self._values), self._values.dtype)
+        self._step = 0
+
+    def _update(self):
+        self._step += 1
+        self.backend._adam_update(
+            self._values,
+            self._grads,
+            self._m,
+            self._v,
+            float(self.lr),
+            float(self.betas[0]),
+            float(self.betas[1]),
+            float(self.eps),
+            float(self.weight_decay),
+            self._step,
+        )
@@ -0,0 +1,111 @@
+"""
+Saving and loading named tensors, e.g. the :meth:`Module.state_dict`.
+
+The file starts with a header describing the tensors, followed by the raw
+storage of each tensor, aligned so that loading maps the file and uses it as
+storage without copying. ::
+
+    MINITRCH | header length (uint64) | JSON header | storage | storage | ...
+"""
+
+import json
+
+import numpy as np
+
+from .tensor import Tensor
+from .tensor_data import TensorData, strides_from_shape
+from .tensor_functions import TensorFunctions
+
+MAGIC = b"MINITRCH"
+
+# Alignment in bytes of the header end and of every storage
+ALIGN = 64
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def save(tensors, path):
+    """
+    Write tensors to a file, with their shapes, strides and dtypes. Views keep
+    their layout, only the storage they use is written.
+
+    Args:
+        tensors (dict of name x :class:`Tensor`): tensors to save
+        path (str): file name
+    """
+    entries = []
+    storages = []
+    for name, t in tensors.items():
+        assert isinstance(t, Tensor), f"Can only save tensors, {name} is not"
+        storage, strides = t._tensor._storage, t._tensor.strides
+        if not isinstance(storage, np.ndarray):
+            # on the GPU
+            storage, strides = t.to_numpy().reshape(-1), None
+        storage = np.ascontiguousarray(storage)
+        entries.append(
+            {
+                "name": name,
+                "dtype": storage.dtype.str,
+                "shape": [int(s) for s in t.shape],
+                "strides": [int(s) for s in strides or strides_from_shape(t.shape)],
+                "size": len(storage),
+            }
+        )
+        storages.append(storage)
+
+    # the offsets depend on the header length, which depends on the offsets
+    header = b""
+    while True:
+        offset = _aligned(len(MAGIC) + 8 + len(header))
+        for entry, storage in zip(entries, storages):
+            entry["offset"] = offset
+            offset = _aligned(offset + storage.nbytes)
+        encoded = json.dumps(entries).encode()
+        if len(encoded) <= len(header):
+            break
+        header = encoded + b" " * (len(encoded) // 8)
+    header = encoded.ljust(len(header))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for entry, storage in zip(entries, storages):
+            f.write(b"\0" * (entry["offset"] - f.tell()))
+            f.write(storage.data)
+
+
+def load(path, backend=TensorFunctions, mode="r"):
+    """
+    Read tensors written by :func:`save`. The file is memory-mapped and is the
+    storage of the tensors, so loading reads only the header and the pages of
+    the tensors are read when they are used.
+
+    Args:
+        path (str): file name
+        backend (:class:`Backend`): tensor backend
+        mode (str): "r" read-only, "r+" writes go to the file, "c" writes stay
+            in memory (see `numpy.memmap`)
+
+    Returns:
+        dict of name x :class:`Tensor` : the tensors, in the order saved
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        assert magic == MAGIC, f"{path} is not a file written by minitorch.save"
+        length = int(np.frombuffer(f.read(8), np.uint64)[0])
+        entries = json.loads(f.read(length))
+
+    tensors = {}
+    if not entries:
+        return tensors
+    mapped = np.memmap(path, dtype=np.uint8, mode=mode)
+    for entry in entries:
+        dtype = np.dtype(entry["dtype"])
+        start = entry["offset"]
+        storage = mapped[start : start + entry["size"] * dtype.itemsize].view(dtype)
+        data = TensorData(storage, tuple(entry["shape"]), tuple(entry["strides"]))
+        tensors[entry["name"]] = Tensor(data, backend=backend)
+    return tensors
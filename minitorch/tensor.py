@@ -3,8 +3,10 @@ Implementation of the core Tensor object for autodifferentiation.
 """
 
 from .autodiff import Variable
-from .tensor_data import TensorData
+from .tensor_data import TensorData, IndexingError, storage_pool
 from . import operators
+from .graph import fill, launch, record
+from numpy import dtype as np_dtype
 
 
 class Tensor(Variable):
@@ -35,9 +37,29 @@ class Tensor(Variable):
     def to_numpy(self):
         """
         Returns:
-             narray : converted to numpy array
+             narray : converted to numpy array, a view of the storage on CPU
         """
-        return self.contiguous()._tensor._storage.reshape(self.shape)
+        if self.backend.cuda:
+            return self.contiguous()._tensor._storage.reshape(self.shape)
+        return self._tensor.to_numpy()
+
+    @staticmethod
+    def from_numpy(values, backend=None):
+        "Create a new tensor using the memory of the numpy array `values`"
+        return Tensor(TensorData.from_numpy(values), backend=backend)
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        Conversion with `numpy.asarray`, without copying if possible. The array
+        is a view of the storage and keeps it alive.
+        """
+        cast = dtype is not None and self.dtype != np_dtype(dtype)
+        if copy is False and (cast or self.backend.cuda):
+            raise ValueError("Converting the tensor to numpy needs a copy")
+        values = self.to_numpy()
+        if cast or (copy and not self.backend.cuda):
+            return values.astype(values.dtype if dtype is None else dtype)
+        return values
 
     # Properties
     @property
@@ -64,10 +86,18 @@ class Tensor(Variable):
         """
         return self._tensor.dims
 
+    @property
+    def dtype(self):
+        """
+        Returns:
+             dtype : element type of the tensor
+        """
+        return self._tensor.dtype
+
     def _ensure_tensor(self, b):
-        "Turns a python number into a tensor with the same backend."
+        "Turns a python number into a tensor with the same backend and dtype."
         if isinstance(b, (int, float)):
-            b = Tensor.make([b], (1,), backend=self.backend)
+            b = Tensor.make([b], (1,), backend=self.backend, dtype=self.dtype)
         else:
             b._type_(self.backend)
         return b
@@ -87,6 +117,10 @@ class Tensor(Variable):
             self, self.backend.Inv.apply(self._ensure_tensor(b))
         )
 
+    def __matmul__(self, b):
+        "Matrix multiplication, broadcasting over all but the last two dims"
+        return self.backend.MatMul.apply(self, b)
+
     def __lt__(self, b):
         return self.backend.LT.apply(self, self._ensure_tensor(b))
 
@@ -99,6 +133,30 @@ class Tensor(Variable):
     def __neg__(self):
         return self.backend.Neg.apply(self)
 
+    # In-place operations, they are not recorded by autodiff
+    def _inplace(self, kernel, b):
+        b = self._ensure_tensor(b)
+        if TensorData.shape_broadcast(self.shape, b.shape) != self.shape:
+            raise IndexingError(f"Cannot broadcast {b.shape} into {self.shape}.")
+        if any(s > 1 and st == 0 for s, st in zip(self.shape, self._tensor.strides)):
+            raise IndexingError("Cannot write in place into a broadcast view.")
+        if not self._tensor._storage.flags.writeable:
+            raise ValueError("Cannot write in place into read-only storage.")
+        kernel(self, b, out=self)
+        return self
+
+    def add_(self, b):
+        "Add `b` to this tensor in place, `b` must broadcast to its shape"
+        return self._inplace(self.backend._add_zip, b)
+
+    def sub_(self, b):
+        "Subtract `b` from this tensor in place, `b` must broadcast to its shape"
+        return self._inplace(self.backend._sub_zip, b)
+
+    def mul_(self, b):
+        "Multiply this tensor by `b` in place, `b` must broadcast to its shape"
+        return self._inplace(self.backend._mul_zip, b)
+
     def sigmoid(self):
         return self.backend.Sigmoid.apply(self)
 
@@ -131,11 +189,32 @@ class Tensor(Variable):
         "Return a contiguous tensor with the same data"
         return self.backend.Copy.apply(self)
 
+    def narrow(self, dim, start, length):
+        "View of the indices `start` to `start + length` of dimension `dim`"
+        return self[(slice(None),) * dim + (slice(start, start + length),)]
+
+    def select(self, dim, index):
+        "View of index `index` of dimension `dim`, without that dimension"
+        return self[(slice(None),) * dim + (index,)]
+
     def __repr__(self):
         return self._tensor.to_string()
 
     def __getitem__(self, key):
-        return self._tensor.get(key)
+        """
+        The value at an index of every dimension, e.g. `t[1, 2]`, or a view
+        sharing the storage for slices and partial indices, e.g. `t[0:32]` or
+        `t[:, 1]` (see :meth:`TensorData.slice`). As in Python, negative
+        indices count from the end.
+        """
+        index = key if isinstance(key, tuple) else (key,)
+        if len(index) == self.dims and not any(isinstance(k, slice) for k in index):
+            return self._tensor.get(self._from_end(index))
+        return self.backend.Slice.apply(self, index)
+
+    def _from_end(self, index):
+        "`index` with negative indices counted from the end, like `slice` does"
+        return tuple(int(k) + s if k < 0 else k for k, s in zip(index, self.shape))
 
     def __setitem__(self, key, val):
         self._tensor.set(key, val)
@@ -154,29 +233,46 @@ class Tensor(Variable):
         return Tensor(tensor_data, backend=self.backend)
 
     @staticmethod
-    def make(storage, shape, strides=None, backend=None):
+    def make(storage, shape, strides=None, backend=None, dtype=None):
         "Create a new tensor from data"
-        return Tensor(TensorData(storage, shape, strides), backend=backend)
+        return Tensor(TensorData(storage, shape, strides, dtype), backend=backend)
+
+    def _as_dtype(self, other):
+        "`other` with the dtype of this tensor, gradients keep the dtype of inputs"
+        if other.dtype == self.dtype:
+            return other
+        # cast by a kernel, so that a captured graph replays it
+        buf = self.zeros(other.shape)
+        self.backend._id_map(other, out=buf)
+        return buf
 
     def expand(self, other):
-        "Method used to allow for backprop over reduce."
+        "Method used to allow for backprop over reduce and broadcasting."
 
         if self.shape == other.shape:
-            return other
+            return self._as_dtype(other)
         shape = TensorData.shape_broadcast(self.shape, other.shape)
-        buf = self.zeros(shape)
-        self.backend._id_map(other, out=buf)
+        if other.shape != shape:
+            # zero-copy view, the broadcast dimensions have stride 0
+            other = other._new(other._tensor.broadcast_to(shape))
         if self.shape == shape:
-            return buf
+            return self._as_dtype(other)
+
+        # the reduction casts to the dtype of buf, and accumulates into its zeros
+        buf = self.zeros(self.shape)
+        record(fill, buf._tensor._storage, 0.0)
+        self.backend._add_reduce(other, out=buf)
+        return buf
 
-        buf2 = self.zeros(self.shape)
-        self.backend._add_reduce(buf, out=buf2)
-        return buf2
+    def zeros(self, shape=None, dtype=None):
+        if dtype is None:
+            dtype = self.dtype
 
-    def zeros(self, shape=None):
         def zero(shape):
             return Tensor.make(
-                [0] * int(operators.prod(shape)), shape, backend=self.backend
+                storage_pool.zeros(int(operators.prod(shape)), dtype),
+                shape,
+                backend=self.backend,
             )
 
         if shape is None:
@@ -186,14 +282,31 @@ class Tensor(Variable):
         out._type_(self.backend)
         return out
 
+    def _add_deriv(self, val):
+        # The gradient buffer is allocated once and accumulated into by a
+        # kernel, without recording history
+        assert self.history.is_leaf(), "Only leaf variables can have derivatives."
+        if self._derivative is None:
+            self._derivative = self.zeros()
+        self._derivative.add_(val)
+
+    def zero_grad_(self):
+        "Reset the gradient to zero, reusing its buffer"
+        if self._derivative is None:
+            self._derivative = self.zeros()
+        else:
+            launch(fill, self._derivative._tensor._storage, 0.0)
+
     def tuple(self):
         return self._tensor.tuple()
 
     def get_data(self):
         return Tensor(self._tensor, backend=self.backend)
 
-    def backward(self, grad_output=None):
+    def backward(self, grad_output=None, retain_graph=False):
         if grad_output is None:
             assert self.shape == (1,), "Must provide grad_output if non-scalar"
-            grad_output = Tensor.make([1.0], (1,), backend=self.backend)
-        super().backward(grad_output)
+            grad_output = Tensor.make(
+                [1.0], (1,), backend=self.backend, dtype=self.dtype
+            )
+        super().backward(grad_output, retain_graph=retain_graph)
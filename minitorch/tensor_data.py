@@ -1,8 +1,11 @@
 import random
+import weakref
 
 from .operators import prod
-from numpy import array, float64, ndarray
-from numba import njit, prange
+from numpy import array, asarray, dtype as np_dtype, empty, float64, memmap, ndarray
+from numpy import ascontiguousarray, float32, promote_types
+from numpy.lib.stride_tricks import as_strided
+from numpy import zeros as np_zeros
 
 MAX_DIMS = 32
 
@@ -128,13 +131,141 @@ def strides_from_shape(shape):
     return tuple(reversed(layout[:-1]))
 
 
+class _Block:
+    """
+    Owner of a pooled buffer while it is used as storage. NumPy keeps it as
+    the base of the storage and of every view derived from it, so it lives
+    exactly as long as some array still uses the buffer.
+    """
+
+    __slots__ = ("__array_interface__", "__weakref__")
+
+    def __init__(self, interface):
+        self.__array_interface__ = interface
+
+
+class StoragePool:
+    """
+    Caching allocator for tensor storage.
+
+    Buffers are grouped by dtype and size, in buckets of four sizes per power
+    of two so that at most a quarter of a buffer is unused (e.g. 10000 elements
+    use a bucket of 10240 elements). When the last array using a buffer is
+    gone, the buffer goes back to the free list of its bucket instead of the
+    system allocator, and a later request of the same bucket reuses it.
+    Requests smaller than `min_size` elements are cheaper to serve with
+    `numpy.zeros` and bypass the pool.
+
+    Attributes:
+        max_bytes (int): cap on the bytes held in the free lists, buffers
+            released beyond it are freed. 0 turns the pool off.
+        min_size (int): smallest number of elements served from the pool
+    """
+
+    def __init__(self, max_bytes=2 ** 30, min_size=4096):
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self._free = {}
+        self._live = {}
+        self.bytes_held = 0
+        self.bytes_in_use = 0
+        self.reset_stats()
+
+    def zeros(self, size, dtype=float64):
+        """
+        Zero filled storage of `size` elements.
+
+        Args:
+            size (int): number of elements
+            dtype (dtype): element type
+
+        Returns:
+            array : storage, from the pool if possible
+        """
+        if size < self.min_size or self.max_bytes == 0:
+            return np_zeros(size, dtype=dtype)
+        step = 1 << max((size - 1).bit_length() - 3, 0)
+        bucket = (np_dtype(dtype), (size + step - 1) // step * step)
+        free = self._free.get(bucket)
+        if free:
+            raw, interface = free.pop()
+            self.hits += 1
+            self.bytes_held -= raw.nbytes
+        else:
+            raw = empty(bucket[1], dtype=dtype)
+            interface = raw.__array_interface__
+            self.misses += 1
+        block = _Block(dict(interface, shape=(size,)))
+        self._live[weakref.ref(block, self._release)] = (raw, interface)
+        self.bytes_in_use += raw.nbytes
+        storage = asarray(block)
+        storage.fill(0.0)
+        return storage
+
+    def _release(self, ref):
+        raw, interface = self._live.pop(ref)
+        self.bytes_in_use -= raw.nbytes
+        if self.bytes_held + raw.nbytes <= self.max_bytes:
+            bucket = (raw.dtype, len(raw))
+            self._free.setdefault(bucket, []).append((raw, interface))
+            self.bytes_held += raw.nbytes
+
+    def flush(self):
+        "Free all buffers held in the free lists."
+        self._free = {}
+        self.bytes_held = 0
+
+    def reset_stats(self):
+        "Reset the hit and miss counters."
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict : hits and misses of the free lists, bytes held in the free
+            lists and bytes handed out as storage
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_held": self.bytes_held,
+            "bytes_in_use": self.bytes_in_use,
+        }
+
+
+# The allocator of `Tensor.zeros` and `zeros`
+storage_pool = StoragePool()
+
+
+def promote_dtypes(dtype_a, dtype_b):
+    """
+    Element type of the result of an operation on two tensors: the smallest
+    type that holds both without loss, e.g. float32 with float64 gives float64.
+    Python numbers take the type of the tensor they are combined with.
+
+    Args:
+        dtype_a (dtype): element type of the first tensor
+        dtype_b (dtype): element type of the second tensor
+
+    Returns:
+        dtype : element type of the result
+    """
+    if dtype_a == dtype_b:
+        return dtype_a
+    return promote_types(dtype_a, dtype_b)
+
+
 class TensorData:
-    def __init__(self, storage, shape, strides=None):
+    def __init__(self, storage, shape, strides=None, dtype=None):
         if isinstance(storage, ndarray):
+            if dtype is not None and storage.dtype != dtype:
+                storage = storage.astype(dtype)
             self._storage = storage
         else:
-            self._storage = array(storage, dtype=float64)
+            self._storage = array(storage, dtype=float64 if dtype is None else dtype)
 
+        dense = strides is None
         if strides is None:
             strides = strides_from_shape(shape)
 
@@ -148,24 +279,111 @@ class TensorData:
         self.dims = len(strides)
         self.size = int(prod(shape))
         self.shape = shape
-        assert len(self._storage) == self.size
+        if dense:
+            assert len(self._storage) == self.size
+        elif self.size > 0:
+            # views may use less storage than their size (stride 0)
+            last = index_to_position(self._shape - 1, self._strides)
+            assert last < len(self._storage), "Strides reach outside of storage"
+
+    @staticmethod
+    def from_file(path, shape, dtype=float64, offset=0, mode="r"):
+        """
+        Tensor data backed by a memory-mapped file of raw values in row-major
+        order, e.g. written by `numpy.ndarray.tofile`. The kernels read the
+        pages of the file as they touch them, so it can be larger than memory.
+
+        Args:
+            path (str): file name
+            shape (tuple): shape of the tensor
+            dtype (dtype): element type of the values in the file
+            offset (int): position in bytes of the first value, e.g. to map a
+                range of rows
+            mode (str): "r" read-only, "r+" writes go to the file, "c" writes
+                stay in memory (see `numpy.memmap`)
+
+        Returns:
+            :class:`TensorData` : tensor data using the file as storage
+        """
+        shape = tuple(shape)
+        storage = memmap(
+            path, dtype=dtype, mode=mode, offset=offset, shape=(int(prod(shape)),)
+        )
+        return TensorData(storage, shape)
+
+    @staticmethod
+    def from_numpy(values):
+        """
+        Tensor data using the memory of a numpy array, without copying. Any
+        layout with non-negative strides is kept, e.g. transposed arrays and
+        slices. Arrays of other dtypes than native float32 and float64, which
+        the kernels support, are copied to float64.
+
+        Args:
+            values (array): numpy array
+
+        Returns:
+            :class:`TensorData` : tensor data sharing the memory of `values`
+        """
+        if values.dtype not in (float32, float64) or values.ndim == 0:
+            values = values.astype(float64).reshape(values.shape or (1,))
+        itemsize = values.itemsize
+        if any(st < 0 or st % itemsize for st in values.strides):
+            values = ascontiguousarray(values)
+        shape = values.shape
+        strides = tuple(st // itemsize for st in values.strides)
+        span = 0
+        if values.size > 0:
+            span = 1 + sum((s - 1) * st for s, st in zip(shape, strides))
+        # a flat view of the memory from the first to the last element
+        storage = as_strided(
+            values, (span,), (itemsize,), writeable=values.flags.writeable
+        )
+        return TensorData(storage, shape, strides)
+
+    def to_numpy(self):
+        """
+        A numpy array using the storage, without copying. Broadcast views
+        (stride 0) give read-only arrays.
+
+        Returns:
+            array : array of the shape with the strides of the tensor data
+        """
+        itemsize = self._storage.itemsize
+        broadcast = any(s > 1 and st == 0 for s, st in zip(self.shape, self.strides))
+        return as_strided(
+            self._storage,
+            self.shape,
+            tuple(st * itemsize for st in self.strides),
+            writeable=self._storage.flags.writeable and not broadcast,
+        )
+
+    @property
+    def dtype(self):
+        "Element type of the storage, float64 by default"
+        return self._storage.dtype
 
     def to_cuda_(self):
+        # numba is only needed by the backends, do not import it with minitorch
+        import numba.cuda
+
         if not numba.cuda.is_cuda_array(self._storage):
             self._storage = numba.cuda.to_device(self._storage)
 
     def is_contiguous(self):
         """
-        Check that the layout is contiguous, i.e. outer dimensions have bigger strides than inner dimensions.
+        Check that the layout is contiguous, i.e. the row-major layout of the
+        shape. Dimensions of size 1 can have any stride, broadcast views with
+        stride 0 are not contiguous.
 
         Returns:
             bool : True if contiguous
         """
-        last = 1e9
-        for stride in self._strides:
-            if stride > last:
+        expected = 1
+        for s, stride in zip(reversed(self.shape), reversed(self.strides)):
+            if s != 1 and stride != expected:
                 return False
-            last = stride
+            expected *= s
         return True
 
     @staticmethod
@@ -228,6 +446,81 @@ class TensorData:
             tuple(self.strides[i] for i in order),
         )
 
+    def broadcast_to(self, shape):
+        """
+        Broadcast the tensor data to a bigger shape without copying. The new
+        leading dimensions and the expanded dimensions of size 1 get stride 0.
+
+        Args:
+            shape (tuple): shape to broadcast to
+
+        Returns:
+            :class:`TensorData`: a new TensorData with the same storage.
+
+        Raises:
+            IndexingError : if the shape does not broadcast to `shape`
+        """
+        shape = tuple(shape)
+        if shape_broadcast(self.shape, shape) != shape:
+            raise IndexingError(f"Cannot broadcast {self.shape} to {shape}.")
+        dif = len(shape) - len(self.shape)
+        strides = [0] * dif
+        for i, s in enumerate(self.shape):
+            strides.append(self.strides[i] if s == shape[i + dif] else 0)
+        return TensorData(self._storage, shape, tuple(strides))
+
+    def slice(self, key):
+        """
+        A view of part of the tensor data without copying. Integers select an
+        index and remove the dimension, slices narrow it to a range of indices,
+        missing trailing dimensions are kept whole. As in Python, negative
+        integers and slice bounds count from the end.
+
+        The view's storage is a view of this storage starting at the offset of
+        the first element and ending after the last one, so kernels need no
+        extra offset argument.
+
+        Args:
+            key (int, slice or tuple): an int or slice per leading dimension
+
+        Returns:
+            :class:`TensorData`: a new TensorData sharing the storage.
+
+        Raises:
+            IndexingError : for out of range indices, too many dimensions and
+                negative slice steps
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > self.dims:
+            raise IndexingError(f"Too many indices {key} for shape {self.shape}.")
+        offset = 0
+        shape = []
+        strides = []
+        for d, k in enumerate(key + (slice(None),) * (self.dims - len(key))):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(self.shape[d])
+                if step < 1:
+                    raise IndexingError(f"Slice step of {k} must be positive.")
+                shape.append(max(stop - start + step - 1, 0) // step)
+                strides.append(self.strides[d] * step)
+            else:
+                start = int(k) + self.shape[d] if k < 0 else int(k)
+                if not 0 <= start < self.shape[d]:
+                    raise IndexingError(f"Index {key} out of range {self.shape}.")
+            if start < self.shape[d]:
+                offset += start * self.strides[d]
+        if not shape:
+            # a single element
+            shape, strides = [1], [1]
+
+        span = 0
+        if prod(shape) > 0:
+            span = 1 + sum((s - 1) * st for s, st in zip(shape, strides))
+        return TensorData(
+            self._storage[offset : offset + span], tuple(shape), tuple(strides)
+        )
+
     def to_string(self):
         s = ""
         for index in self.indices():
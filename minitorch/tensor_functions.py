@@ -7,6 +7,8 @@ from .tensor_ops import TensorOps  # acces to zip, map and reduce
 import numpy as np
 from . import operators
 from .tensor import Tensor
+from .tensor_data import TensorData, storage_pool
+from .graph import launch
 import random
 
 
@@ -47,15 +49,22 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
 
     # Zips
     add_zip = tensor_ops.zip(operators.add)
+    sub_zip = tensor_ops.zip(operators.sub)
     mul_zip = tensor_ops.zip(operators.mul)
     lt_zip = tensor_ops.zip(operators.lt)
     eq_zip = tensor_ops.zip(operators.eq)
     relu_back_zip = tensor_ops.zip(operators.relu_back)
     log_back_zip = tensor_ops.zip(operators.log_back)
     inv_back_zip = tensor_ops.zip(operators.inv_back)
+    # Composed operators, compiled into a single kernel each
+    sigmoid_back_zip = tensor_ops.zip(operators.sigmoid_back)
+    exp_back_zip = tensor_ops.zip(operators.exp_back)
 
     # Reduce
     add_reduce = tensor_ops.reduce(operators.add)
+
+    # Matrix multiply
+    matrix_multiply = tensor_ops.matrix_multiply
     # TODO why are the names t1, t2 vs. a and b (?)
 
     class Backend:
@@ -63,6 +72,14 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
         # Why is id_map and add_reduce here again?
         _id_map = id_map
         _add_reduce = add_reduce
+        # Kernels of the in-place Tensor methods
+        _add_zip = add_zip
+        _sub_zip = sub_zip
+        _mul_zip = mul_zip
+        # Optimizer steps on flat buffers, see `minitorch.optim`, None if
+        # the ops have no kernel for them
+        _sgd_update = getattr(tensor_ops, "sgd_update", None)
+        _adam_update = getattr(tensor_ops, "adam_update", None)
 
         class Neg(Function):
             @staticmethod
@@ -114,10 +131,7 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
             @staticmethod
             def backward(ctx, grad_output):
                 a = ctx.saved_values
-                return mul_zip(
-                    grad_output,
-                    sigmoid_map(a) - mul_zip(sigmoid_map(a), sigmoid_map(a)),
-                )
+                return sigmoid_back_zip(a, grad_output)
 
         class ReLU(Function):
             @staticmethod
@@ -150,12 +164,11 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
             @staticmethod
             def backward(ctx, grad_output):
                 a = ctx.saved_values
-                return exp_map(a, grad_output)
+                return exp_back_zip(a, grad_output)
 
         class Sum(Function):
             @staticmethod
             def forward(ctx, a, dim):
-                ctx.save_for_backward(a.shape, dim)
                 if dim is not None:
                     return add_reduce(a, [dim])
                 else:
@@ -163,15 +176,10 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
 
             @staticmethod
             def backward(ctx, grad_output):
-                a_shape, dim = ctx.saved_values
-                # START Code Update
-                if dim is None:
-                    out = grad_output.zeros(a_shape)
-                    out._tensor._storage[:] = grad_output[0]
-                    return out
-                else:
-                    return grad_output  # this can always be braodcast, expanding
-                # explicitly would be a waste of memory
+                # This can always be broadcast, `Tensor.expand` turns it into a
+                # stride 0 view of the input shape, expanding explicitly would be
+                # a waste of memory
+                return grad_output
 
         class Mean(Function):
             @staticmethod
@@ -186,25 +194,18 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
 
                 n = operators.prod([a.shape[i] for i in dim])
 
-                ctx.save_for_backward(n, a.shape, dim)
-                x._tensor._storage[:] /= n
+                ctx.save_for_backward(n)
+                launch(np.divide, x._tensor._storage, n, x._tensor._storage)
 
                 return x
 
             @staticmethod
             def backward(ctx, grad_output):
                 # Like the backward pass for sum, the expanded dimensions are not
-                # created explicitly
-                n, a_shape, dim = ctx.saved_values
-                if dim is None:
-                    out = grad_output.zeros(a_shape)
-                    out._tensor._storage[:] = grad_output[0] / n
-                    return out
-                else:
-                    out = grad_output
-                    out._tensor._storage[:] /= n
-
-                return out
+                # created explicitly. grad_output may share its storage with
+                # other gradients, so it is not divided in place.
+                n = ctx.saved_values
+                return grad_output * (1.0 / n)
 
         class LT(Function):
             @staticmethod
@@ -227,15 +228,30 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
         class Permute(Function):
             @staticmethod
             def forward(ctx, a, order):
-                x = id_map(a)
-                x.shape = tuple(a.shape[i] for i in order)
-                x.stride = tuple(a.stride[i] for i in order)
                 ctx.save_for_backward(order)
+                return a._new(a._tensor.permute(*order))
 
             @staticmethod
             def backward(ctx, grad_output):
                 order = ctx.saved_values
-                return grad_output._new(grad_output._tensor.permute(*order))
+                inverse = [0] * len(order)
+                for i, o in enumerate(order):
+                    inverse[o] = i
+                return grad_output._new(grad_output._tensor.permute(*inverse))
+
+        class Slice(Function):
+            @staticmethod
+            def forward(ctx, a, key):
+                ctx.save_for_backward(a.shape, key)
+                return a._new(a._tensor.slice(key))
+
+            @staticmethod
+            def backward(ctx, grad_output):
+                shape, key = ctx.saved_values
+                # copy the gradient into the same view of a zero gradient
+                grad = grad_output.zeros(shape)
+                id_map(grad_output, out=grad._new(grad._tensor.slice(key)))
+                return grad
 
         class View(Function):
             @staticmethod
@@ -247,10 +263,35 @@ def make_tensor_backend(tensor_ops, is_cuda=False):
             @staticmethod
             def backward(ctx, grad_output):
                 original = ctx.saved_values
+                if not grad_output._tensor.is_contiguous():
+                    # e.g. a stride 0 view created by `Tensor.expand`
+                    grad_output = grad_output.contiguous()
                 return Tensor.make(
                     grad_output._tensor._storage, original, backend=grad_output.backend
                 )
 
+        class MatMul(Function):
+            @staticmethod
+            def forward(ctx, t1, t2):
+                ctx.save_for_backward(t1, t2)
+                return matrix_multiply(t1, t2)
+
+            @staticmethod
+            def backward(ctx, grad_output):
+                t1, t2 = ctx.saved_values
+
+                def transpose(a):
+                    order = list(range(a.dims))
+                    order[-2], order[-1] = order[-1], order[-2]
+                    return a._new(a._tensor.permute(*order))
+
+                # the leading dims of the gradients are summed back to the
+                # shapes of t1 and t2 by `Tensor.expand`
+                return (
+                    matrix_multiply(grad_output, transpose(t2)),
+                    matrix_multiply(transpose(t1), grad_output),
+                )
+
         class Copy(Function):
             @staticmethod
             def forward(ctx, a):
@@ -267,21 +308,34 @@ TensorFunctions = make_tensor_backend(TensorOps)
 
 
 # Helpers for Constructing tensors
-def zeros(shape, backend=TensorFunctions):
+def zeros(shape, backend=TensorFunctions, dtype=np.float64):
     """
     Produce a zero tensor of size `shape`.
 
     Args:
         shape (tuple): shape of tensor
         backend (:class:`Backend`): tensor backend
+        dtype (dtype): element type, e.g. `numpy.float32`
 
     Returns:
         :class:`Tensor` : new tensor
     """
-    return Tensor.make([0] * int(operators.prod(shape)), shape, backend=backend)
+    return Tensor.make(
+        storage_pool.zeros(int(operators.prod(shape)), dtype), shape, backend=backend
+    )
+
+
+# Generator used by `rand` when none is given
+_generator = np.random.default_rng()
 
 
-def rand(shape, backend=TensorFunctions, requires_grad=False):
+def rand(
+    shape,
+    backend=TensorFunctions,
+    requires_grad=False,
+    generator=None,
+    dtype=np.float64,
+):
     """
     Produce a random tensor of size `shape`.
 
@@ -289,17 +343,26 @@ def rand(shape, backend=TensorFunctions, requires_grad=False):
         shape (tuple): shape of tensor
         backend (:class:`Backend`): tensor backend
         requires_grad (bool): turn on autodifferentiation
+        generator (:class:`numpy.random.Generator` or int): generator or seed
+            to draw the values from, a module wide generator if None
+        dtype (dtype): element type, `numpy.float32` or `numpy.float64`
 
     Returns:
         :class:`Tensor` : new tensor
     """
-    vals = [random.random() for _ in range(int(operators.prod(shape)))]
+    if generator is None:
+        generator = _generator
+    else:
+        generator = np.random.default_rng(generator)
+    vals = generator.random(int(operators.prod(shape)), dtype=dtype)
     tensor = Tensor.make(vals, shape, backend=backend)
     tensor.requires_grad_(requires_grad)
     return tensor
 
 
-def tensor(ls, shape=None, backend=TensorFunctions, requires_grad=False):
+def tensor(
+    ls, shape=None, backend=TensorFunctions, requires_grad=False, dtype=np.float64
+):
     """
     Produce a tensor with data ls and shape `shape`.
 
@@ -308,18 +371,20 @@ def tensor(ls, shape=None, backend=TensorFunctions, requires_grad=False):
         shape (tuple): shape of tensor
         backend (:class:`Backend`): tensor backend
         requires_grad (bool): turn on autodifferentiation
+        dtype (dtype): element type, e.g. `numpy.float32`
 
     Returns:
         :class:`Tensor` : new tensor
     """
+    vals = np.array(ls, dtype=dtype).reshape(-1)
     if not shape:
-        shape = (len(ls),)
-    tensor = Tensor.make(ls, shape, backend=backend)
+        shape = (len(vals),)
+    tensor = Tensor.make(vals, shape, backend=backend)
     tensor.requires_grad_(requires_grad)
     return tensor
 
 
-def tensor_fromlist(ls, backend=TensorFunctions, requires_grad=False):
+def tensor_fromlist(ls, backend=TensorFunctions, requires_grad=False, dtype=np.float64):
     """
     Produce a tensor with data and shape from ls
 
@@ -327,26 +392,55 @@ def tensor_fromlist(ls, backend=TensorFunctions, requires_grad=False):
         ls (list): data for tensor
         backend (:class:`Backend`): tensor backend
         requires_grad (bool): turn on autodifferentiation
+        dtype (dtype): element type, e.g. `numpy.float32`
+
+    Returns:
+        :class:`Tensor` : new tensor
+    """
+    vals = np.array(ls, dtype=dtype)
+    return tensor(
+        vals, vals.shape, backend=backend, requires_grad=requires_grad, dtype=dtype
+    )
+
+
+def from_numpy(values, backend=TensorFunctions, requires_grad=False):
+    """
+    Produce a tensor using the memory of a numpy array, see
+    :meth:`TensorData.from_numpy`. Changes to one are seen by the other.
+
+    Args:
+        values (array): numpy array of floats
+        backend (:class:`Backend`): tensor backend
+        requires_grad (bool): turn on autodifferentiation
 
     Returns:
         :class:`Tensor` : new tensor
     """
+    tensor = Tensor.from_numpy(values, backend=backend)
+    tensor.requires_grad_(requires_grad)
+    return tensor
+
+
+def load_mmap(
+    path, shape, backend=TensorFunctions, dtype=np.float64, offset=0, mode="r"
+):
+    """
+    Produce a tensor backed by a memory-mapped file of raw values, see
+    :meth:`TensorData.from_file`. Nothing is read until the tensor is used.
+
+    Args:
+        path (str): file name
+        shape (tuple): shape of tensor
+        backend (:class:`Backend`): tensor backend
+        dtype (dtype): element type of the values in the file
+        offset (int): position in bytes of the first value
+        mode (str): "r" read-only, "r+" or "c" writable (see `numpy.memmap`)
 
-    def shape(ls):
-        if isinstance(ls, (list, tuple)):
-            return [len(ls)] + shape(ls[0])
-        else:
-            return []
-
-    def flatten(ls):
-        if isinstance(ls, (list, tuple)):
-            return [y for x in ls for y in flatten(x)]
-        else:
-            return [ls]
-
-    cur = flatten(ls)
-    shape = shape(ls)
-    return tensor(cur, tuple(shape), backend=backend, requires_grad=requires_grad)
+    Returns:
+        :class:`Tensor` : new tensor
+    """
+    data = TensorData.from_file(path, shape, dtype, offset, mode)
+    return Tensor(data, backend=backend)
 
 
 # Gradient check for tensors
@@ -4,8 +4,10 @@ from .tensor_data import (
     index_to_position,
     broadcast_index,
     shape_broadcast,
+    promote_dtypes,
     MAX_DIMS,
 )
+from .graph import fill, launch
 
 
 def tensor_map(fn):
@@ -32,9 +34,8 @@ def tensor_map(fn):
         in_index = np.empty_like(in_shape, dtype=np.int32)
         out_index = np.empty_like(out_shape, dtype=np.int32)
 
-        for i in range(len(out)):
-            # note that iterating over len(out) also iterates over all broad_indices
-            # because of the above assertion
+        # out can be a view that uses only part of its storage
+        for i in range(int(np.prod(out_shape))):
             count(i, out_shape, out_index)
             # now we map the broadcasted index to the input index
             broadcast_index(
@@ -83,7 +84,7 @@ def map(fn):
     def ret(a, out=None):
         if out is None:
             out = a.zeros(a.shape)
-        f(*out.tuple(), *a.tuple())
+        launch(f, *out.tuple(), *a.tuple())
         return out
 
     return ret
@@ -126,7 +127,7 @@ def tensor_zip(fn):
         a_index = np.empty_like(a_shape, dtype=np.int32)
         b_index = np.empty_like(b_shape, dtype=np.int32)
 
-        for i in range(len(out)):
+        for i in range(int(np.prod(out_shape))):
             count(i, out_shape, out_index)
             broadcast_index(
                 big_index=out_index,
@@ -159,6 +160,8 @@ def zip(fn):
         fn: function from two floats-to-float to apply
         a (:class:`TensorData`): tensor to zip over
         b (:class:`TensorData`): tensor to zip over
+        out (:class:`TensorData`): optional, tensor data to fill in, `a` and
+               `b` should broadcast to its shape. Can be `a` or `b` itself.
 
     Returns:
         :class:`TensorData` : new tensor data
@@ -166,13 +169,14 @@ def zip(fn):
 
     f = tensor_zip(fn)
 
-    def ret(a, b):
-        if a.shape != b.shape:
-            c_shape = shape_broadcast(a.shape, b.shape)
-        else:
-            c_shape = a.shape
-        out = a.zeros(c_shape)
-        f(*out.tuple(), *a.tuple(), *b.tuple())
+    def ret(a, b, out=None):
+        if out is None:
+            if a.shape != b.shape:
+                c_shape = shape_broadcast(a.shape, b.shape)
+            else:
+                c_shape = a.shape
+            out = a.zeros(c_shape, promote_dtypes(a.dtype, b.dtype))
+        launch(f, *out.tuple(), *a.tuple(), *b.tuple())
         return out
 
     return ret
@@ -218,7 +222,7 @@ def tensor_reduce(fn):
         out_index = np.empty_like(out_shape)  # 0s at the reduce dim
         reduce_index = np.empty_like(out_shape)  # 0s at the non-reduced dims
 
-        for i in range(len(out)):  # outer loop
+        for i in range(int(np.prod(out_shape))):  # outer loop
             count(i, out_shape, out_index)
             out_pos = index_to_position(out_index, out_strides)
             for j in range(reduce_size):  # inner loop over dims where to apply reduce
@@ -259,7 +263,7 @@ def reduce(fn, start=0.0):
                 out_shape[d] = 1
             # Other values when not sum.
             out = a.zeros(tuple(out_shape))
-            out._tensor._storage[:] = start
+            launch(fill, out._tensor._storage, start)
         else:
             old_shape = out.shape
             diff = len(a.shape) - len(out.shape)
@@ -279,7 +283,7 @@ def reduce(fn, start=0.0):
                 reduce_shape.append(1)
 
         # Apply
-        f(*out.tuple(), *a.tuple(), reduce_shape, reduce_size)
+        launch(f, *out.tuple(), *a.tuple(), reduce_shape, reduce_size)
 
         if old_shape is not None:
             out = out.view(*old_shape)
@@ -289,7 +293,157 @@ def reduce(fn, start=0.0):
     # END Code Update
 
 
+def tensor_matrix_multiply(
+    out,
+    out_shape,
+    out_strides,
+    a_storage,
+    a_shape,
+    a_strides,
+    b_storage,
+    b_shape,
+    b_strides,
+):
+    """
+    Tensor matrix multiply function.
+
+    Should work for any tensor shapes that broadcast as long as ::
+
+        assert a_shape[-1] == b_shape[-2]
+
+    Args:
+        out (array): storage for `out` tensor
+        out_shape (array): shape for `out` tensor
+        out_strides (array): strides for `out` tensor
+        a_storage (array): storage for `a` tensor
+        a_shape (array): shape for `a` tensor
+        a_strides (array): strides for `a` tensor
+        b_storage (array): storage for `b` tensor
+        b_shape (array): shape for `b` tensor
+        b_strides (array): strides for `b` tensor
+
+    Returns:
+        None : Fills in `out`
+    """
+    out_index = np.empty_like(out_shape, dtype=np.int32)
+    a_index = np.empty_like(a_shape, dtype=np.int32)
+    b_index = np.empty_like(b_shape, dtype=np.int32)
+
+    for i in range(int(np.prod(out_shape))):
+        count(i, out_shape, out_index)
+        # the batch dims broadcast, the row of a and the column of b are taken
+        # from out and the inner dim is overwritten in the loop below
+        broadcast_index(out_index, out_shape, a_shape, a_index)
+        broadcast_index(out_index, out_shape, b_shape, b_index)
+        acc = 0.0
+        for k in range(a_shape[-1]):
+            a_index[-1] = k
+            b_index[-2] = k
+            acc += (
+                a_storage[index_to_position(a_index, a_strides)]
+                * b_storage[index_to_position(b_index, b_strides)]
+            )
+        out[index_to_position(out_index, out_strides)] = acc
+
+
+def matrix_multiply(a, b, out=None):
+    """
+    Tensor matrix multiply
+
+    Should work for any tensor shapes that broadcast in the first n-2 dims and
+    have ::
+
+        assert a.shape[-1] == b.shape[-2]
+
+    Args:
+        a (:class:`TensorData`): tensor a
+        b (:class:`TensorData`): tensor b
+        out (:class:`TensorData`): optional, tensor data of the result shape
+               to fill in, must not share storage with `a` or `b`
+
+    Returns:
+        :class:`TensorData` : new tensor data
+    """
+    ls = list(shape_broadcast(a.shape[:-2], b.shape[:-2]))
+    ls.append(a.shape[-2])
+    ls.append(b.shape[-1])
+    assert a.shape[-1] == b.shape[-2]
+    if out is None:
+        out = a.zeros(tuple(ls), promote_dtypes(a.dtype, b.dtype))
+    assert out.shape == tuple(ls)
+
+    launch(tensor_matrix_multiply, *out.tuple(), *a.tuple(), *b.tuple())
+    return out
+
+
+def sgd_update(values, grads, velocity, lr, momentum, weight_decay):
+    """
+    SGD step on the flat values of all parameters, in place ::
+
+        g = grads + weight_decay * values
+        velocity = momentum * velocity + g
+        values -= lr * velocity
+
+    Args:
+        values (array): parameter values, updated in place
+        grads (array): gradients
+        velocity (array): momentum buffer, updated in place, unused without
+            momentum
+        lr (float): learning rate
+        momentum (float): momentum factor
+        weight_decay (float): L2 penalty factor
+
+    Returns:
+        None : Fills in `values`
+    """
+    g = grads + weight_decay * values if weight_decay else grads
+    if momentum:
+        velocity *= momentum
+        velocity += g
+        g = velocity
+    values -= lr * g
+
+
+def adam_update(values, grads, m, v, lr, beta1, beta2, eps, weight_decay, step):
+    """
+    Adam step on the flat values of all parameters, in place ::
+
+        g = grads + weight_decay * values
+        m = beta1 * m + (1 - beta1) * g
+        v = beta2 * v + (1 - beta2) * g ** 2
+        values -= lr * m_hat / (sqrt(v_hat) + eps)
+
+    with `m_hat` and `v_hat` the bias corrected moments of step `step`.
+
+    Args:
+        values (array): parameter values, updated in place
+        grads (array): gradients
+        m (array): first moments, updated in place
+        v (array): second moments, updated in place
+        lr (float): learning rate
+        beta1 (float): decay of the first moments
+        beta2 (float): decay of the second moments
+        eps (float): added to the denominator
+        weight_decay (float): L2 penalty factor
+        step (int): number of the step, from 1
+
+    Returns:
+        None : Fills in `values`
+    """
+    g = grads + weight_decay * values if weight_decay else grads
+    m *= beta1
+    m += (1 - beta1) * g
+    v *= beta2
+    v += (1 - beta2) * g * g
+    step_size = lr / (1 - beta1 ** step)
+    bias2 = np.sqrt(1 - beta2 ** step)
+    values -= step_size * m / (np.sqrt(v) / bias2 + eps)
+
+
 class TensorOps:
     map = map
     zip = zip
     reduce = reduce
+    matrix_multiply = matrix_multiply
+    sgd_update = sgd_update
+    adam_update = adam_update
@@ -0,0 +1,39 @@
+"""
+Time of `backward` on Scalar graphs of growing size.
+
+The graph is a weighted sum of N inputs that is added up pairwise, so a whole
+level of the tree is waiting for its derivatives at the same time, as in a wide
+Scalar network.
+
+>>> python project/bench_backward.py --SIZES 1000 2000 4000 8000 16000
+"""
+import argparse
+import time
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--SIZES", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000]
+)
+args = parser.parse_args()
+
+
+def build(n):
+    w = minitorch.Scalar(0.5)
+    w.requires_grad_(True)
+    terms = [minitorch.Scalar(float(i)) * w for i in range(n)]
+    while len(terms) > 1:
+        pairs = [terms[i] + terms[i + 1] for i in range(0, len(terms) - 1, 2)]
+        terms = pairs + terms[len(terms) - len(terms) % 2 :]
+    return w, terms[0]
+
+
+print(f"{'nodes':>8s} {'backward':>12s}")
+for n in args.SIZES:
+    w, total = build(n)
+    start = time.perf_counter()
+    total.backward()
+    elapsed = time.perf_counter() - start
+    assert w.derivative == n * (n - 1) / 2
+    print(f"{2 * n:8d} {elapsed * 1000:9.1f} ms")
@@ -0,0 +1,33 @@
+"""
+Time to create tensors of growing size with the constructors.
+
+>>> python project/bench_constructors.py --SIZES 10000 1000000 10000000
+"""
+import argparse
+import time
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--SIZES", type=int, nargs="+", default=[10000, 1000000, 10000000]
+)
+args = parser.parse_args()
+
+
+def timeit(f, *vals):
+    start = time.perf_counter()
+    f(*vals)
+    return time.perf_counter() - start
+
+
+print(f"{'size':>10s} {'zeros':>12s} {'rand':>12s} {'fromlist':>12s}")
+for n in args.SIZES:
+    rows = [[float(i)] * 10 for i in range(n // 10)]
+    t_zeros = timeit(minitorch.zeros, (n,))
+    t_rand = timeit(minitorch.rand, (n,))
+    t_list = timeit(minitorch.tensor_fromlist, rows)
+    print(
+        f"{n:10d} {t_zeros * 1000:9.1f} ms {t_rand * 1000:9.1f} ms"
+        f" {t_list * 1000:9.1f} ms"
+    )
@@ -0,0 +1,69 @@
+"""
+Training steps of an MLP and bandwidth bound kernels in float64 and float32,
+with the bytes held by the parameters and their gradients.
+
+>>> python project/bench_dtype.py --PTS 1000 --HIDDEN 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--PTS", type=int, default=1000, help="number of points")
+parser.add_argument("--HIDDEN", type=int, default=500, help="number of hiddens")
+parser.add_argument("--SIZE", type=int, default=10_000_000, help="kernel elements")
+parser.add_argument("--STEPS", type=int, default=20, help="timed steps")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+
+
+def timed(fn):
+    fn()  # compile
+    start = time.perf_counter()
+    for _ in range(args.STEPS):
+        fn()
+    return (time.perf_counter() - start) / args.STEPS
+
+
+def run(dtype):
+    def param(*shape):
+        r = minitorch.rand(shape, backend=BACKEND, dtype=dtype) - 0.5
+        return minitorch.Parameter(r)
+
+    w1, b1 = param(2, args.HIDDEN), param(args.HIDDEN)
+    w2, b2 = param(args.HIDDEN, args.HIDDEN), param(args.HIDDEN)
+    w3, b3 = param(args.HIDDEN, 1), param(1)
+    params = [w1, b1, w2, b2, w3, b3]
+    X = minitorch.rand((args.PTS, 2), backend=BACKEND, dtype=dtype)
+
+    def step():
+        h = (X @ w1.value + b1.value).relu()
+        h = (h @ w2.value + b2.value).relu()
+        out = (h @ w3.value + b3.value).sigmoid()
+        out.sum().view(1).backward()
+        for p in params:
+            p.value.sub_(p.value.grad.mul_(0.01 / args.PTS))
+            p.value.zero_grad_()
+
+    a = minitorch.rand((args.SIZE,), backend=BACKEND, dtype=dtype)
+    b = minitorch.rand((args.SIZE,), backend=BACKEND, dtype=dtype)
+    nbytes = sum(2 * p.value._tensor._storage.nbytes for p in params)
+    return {
+        "step": timed(step),
+        "zip": timed(lambda: a * b),
+        "reduce": timed(lambda: a.sum()),
+        "params": nbytes,
+    }
+
+
+for dtype in [np.float64, np.float32]:
+    r = run(dtype)
+    print(
+        f"{np.dtype(dtype).name:8s} {r['step'] * 1000:8.2f} ms/step"
+        f" {r['zip'] * 1000:8.2f} ms/zip {r['reduce'] * 1000:8.2f} ms/reduce"
+        f" {r['params'] / 2 ** 20:7.2f} MB params+grads"
+    )
@@ -0,0 +1,55 @@
+"""
+Elementwise throughput of the FastOps map and zip kernels.
+
+The contiguous fast path is compared with the general index path. For the
+general path the input is broadcast from shape (N,) to (1, N): it touches the
+same memory in the same order, but goes through `count`, `broadcast_index` and
+`index_to_position` for every element, like every call did before the fast path.
+
+>>> python project/bench_elementwise.py --SIZE 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+from numba import njit
+
+import minitorch
+from minitorch.fast_ops import tensor_map, tensor_zip
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--SIZE", type=int, default=1000000, help="number of elements")
+parser.add_argument("--REPEATS", type=int, default=20, help="timed runs per kernel")
+args = parser.parse_args()
+
+N = args.SIZE
+
+
+def timeit(f, *vals):
+    f(*vals)  # compile
+    start = time.perf_counter()
+    for _ in range(args.REPEATS):
+        f(*vals)
+    return (time.perf_counter() - start) / args.REPEATS
+
+
+a = np.random.random(N)
+b = np.random.random(N)
+out = np.zeros(N)
+
+flat = (np.array([N]), np.array([1]))
+wide = (np.array([1, N]), np.array([N, 1]))
+
+fmap = tensor_map(njit()(minitorch.operators.sigmoid))
+fzip = tensor_zip(njit()(minitorch.operators.mul))
+
+results = [
+    ("map contiguous", timeit(fmap, out, *flat, a, *flat)),
+    ("map general", timeit(fmap, out, *wide, a, *flat)),
+    ("zip contiguous", timeit(fzip, out, *flat, a, *flat, b, *flat)),
+    ("zip general", timeit(fzip, out, *wide, a, *flat, b, *flat)),
+]
+
+print(f"{N} elements, {args.REPEATS} repeats")
+for name, t in results:
+    print(f"{name:16s} {t * 1000:8.2f} ms  {N / t / 1e6:8.1f} Melem/s")
@@ -0,0 +1,48 @@
+"""
+Sigmoid backward as a chain of map/zip kernels, one pass over memory per
+operator, compared with the fused `operators.sigmoid_back` kernel.
+
+>>> python project/bench_fusion.py --N 10000000
+"""
+import argparse
+import time
+
+import minitorch
+from minitorch import operators
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--N", type=int, default=10000000, help="number of elements")
+parser.add_argument("--REPEATS", type=int, default=10, help="timed runs")
+args = parser.parse_args()
+
+FastOps = minitorch.FastOps
+BACKEND = minitorch.make_tensor_backend(FastOps)
+sigmoid_map = FastOps.map(operators.sigmoid)
+mul_zip = FastOps.zip(operators.mul)
+add_zip = FastOps.zip(operators.add)
+neg_map = FastOps.map(operators.neg)
+sigmoid_back_zip = FastOps.zip(operators.sigmoid_back)
+
+
+def chained(a, g):
+    s = sigmoid_map(a)
+    return mul_zip(g, add_zip(s, neg_map(mul_zip(s, s))))
+
+
+def fused(a, g):
+    return sigmoid_back_zip(a, g)
+
+
+def timeit(f, *vals):
+    f(*vals)  # compile
+    start = time.perf_counter()
+    for _ in range(args.REPEATS):
+        f(*vals)
+    return (time.perf_counter() - start) / args.REPEATS
+
+
+a = minitorch.rand((args.N,), backend=BACKEND)
+g = minitorch.rand((args.N,), backend=BACKEND)
+assert abs((chained(a, g) - fused(a, g)).to_numpy()).max() < 1e-12
+for name, f in [("chained", chained), ("fused", fused)]:
+    print(f"{name:8s} {timeit(f, a, g) * 1000:9.2f} ms")
@@ -0,0 +1,64 @@
+"""
+Training steps of small MLPs, where the Python overhead of the tensor
+functions and of backward dominates, run eagerly and replayed from a graph
+captured with `minitorch.capture`.
+
+>>> python project/bench_graph.py --STEPS 2000
+"""
+import argparse
+import time
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--STEPS", type=int, default=2000, help="steps per run")
+parser.add_argument("--BATCH", type=int, default=32, help="batch size")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+
+
+def param(*shape):
+    return minitorch.Parameter(minitorch.rand(shape, backend=BACKEND) - 0.5)
+
+
+def make_step(hidden):
+    w1, b1 = param(2, hidden), param(hidden)
+    w2, b2 = param(hidden, hidden), param(hidden)
+    w3, b3 = param(hidden, 1), param(1)
+    optimizer = minitorch.optim.SGD([w1, b1, w2, b2, w3, b3], lr=0.01)
+
+    def step(x, y):
+        h = (x @ w1.value + b1.value).relu()
+        h = (h @ w2.value + b2.value).relu()
+        out = (h @ w3.value + b3.value).sigmoid().view(y.shape[0])
+        prob = (out * y) + (out - 1.0) * (y - 1.0)
+        loss = -prob.log().sum().view(1)
+        loss.backward()
+        optimizer.step()
+        optimizer.zero_grad()
+        return loss
+
+    return step
+
+
+def per_step(run, x, y):
+    run(x, y)
+    start = time.perf_counter()
+    for _ in range(args.STEPS):
+        run(x, y)
+    return (time.perf_counter() - start) * 1e6 / args.STEPS
+
+
+x = minitorch.rand((args.BATCH, 2), backend=BACKEND)
+y = (minitorch.rand((args.BATCH,), backend=BACKEND) > 0.5) * 1.0
+for hidden in [2, 10, 50, 100]:
+    step = make_step(hidden)
+    eager = per_step(step, x, y)
+    graph = minitorch.capture(step, x, y)
+    replay = per_step(graph, x, y)
+    print(
+        f"hidden {hidden:4d} ops {len(graph.ops):3d}"
+        f" eager {eager:8.1f} us/step replay {replay:8.1f} us/step"
+        f" {eager / replay:5.1f}x"
+    )
@@ -0,0 +1,45 @@
+"""
+Time of `import minitorch` in a fresh interpreter, from `python -X importtime`,
+compared with a budget. Exits with status 1 if the median is over budget.
+
+>>> python project/bench_import.py --RUNS 5 --BUDGET 200
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--RUNS", type=int, default=5, help="fresh interpreters")
+parser.add_argument("--BUDGET", type=float, default=200.0, help="budget in ms")
+parser.add_argument("--TOP", type=int, default=5, help="slowest modules to list")
+parser.add_argument("--IMPORT", default="minitorch", help="module to import")
+args = parser.parse_args()
+
+
+def importtime():
+    "Cumulative import time in ms of every module imported for `args.IMPORT`."
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.IMPORT}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+runs = [importtime() for _ in range(args.RUNS)]
+total = statistics.median(run[args.IMPORT] for run in runs)
+last = runs[-1]
+print("slowest imports of the last run (cumulative):")
+for name in sorted(last, key=last.get, reverse=True)[: args.TOP]:
+    print(f"  {last[name]:8.1f} ms {name}")
+print(f"numba imported: {'numba' in last}")
+print(f"import {args.IMPORT}: {total:.1f} ms median, budget {args.BUDGET:.0f} ms")
+sys.exit(0 if total <= args.BUDGET else 1)
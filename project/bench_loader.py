@@ -0,0 +1,52 @@
+"""
+One epoch of MLP training steps over mini-batches from `minitorch.DataLoader`,
+in order (views) and shuffled (gathered), with and without prefetching.
+
+>>> python project/bench_loader.py --PTS 200000 --FEATURES 64 --BATCH 256
+"""
+import argparse
+import time
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--PTS", type=int, default=200000, help="number of points")
+parser.add_argument("--FEATURES", type=int, default=64, help="features per point")
+parser.add_argument("--HIDDEN", type=int, default=64, help="number of hiddens")
+parser.add_argument("--BATCH", type=int, default=256, help="batch size")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+
+
+def param(*shape):
+    return minitorch.Parameter(minitorch.rand(shape, backend=BACKEND) - 0.5)
+
+
+w1, w2 = param(args.FEATURES, args.HIDDEN), param(args.HIDDEN, 1)
+X = minitorch.rand((args.PTS, args.FEATURES), backend=BACKEND)
+y = minitorch.rand((args.PTS,), backend=BACKEND)
+
+
+def step(x, target):
+    out = ((x @ w1.value).relu() @ w2.value).sigmoid().view(target.shape[0])
+    ((out - target) * (out - target)).sum().view(1).backward()
+    for p in [w1, w2]:
+        p.value.sub_(p.value.grad.mul_(0.01 / target.shape[0]))
+        p.value.zero_grad_()
+
+
+step(X[0:2], y[0:2])  # compile
+for shuffle in [False, True]:
+    for prefetch in [0, 2]:
+        loader = minitorch.DataLoader(
+            X, y, batch_size=args.BATCH, shuffle=shuffle, prefetch=prefetch
+        )
+        start = time.perf_counter()
+        for x_batch, y_batch in loader:
+            step(x_batch, y_batch)
+        epoch = time.perf_counter() - start
+        print(
+            f"shuffle {shuffle!s:5s} prefetch {prefetch}"
+            f" {epoch * 1000 / len(loader):7.3f} ms/batch {epoch:6.2f} s/epoch"
+        )
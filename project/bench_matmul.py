@@ -0,0 +1,47 @@
+"""
+GFLOP/s of the FastOps matrix multiply compared with `numpy.matmul` on
+square matrices.
+
+>>> python project/bench_matmul.py --SIZES 64 128 256 512 1024 2048
+"""
+import argparse
+import time
+
+import numpy as np
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--SIZES", type=int, nargs="+", default=[64, 128, 256, 512, 1024, 2048]
+)
+parser.add_argument("--BATCH", type=int, default=1, help="leading batch dim")
+args = parser.parse_args()
+
+FastTensorBackend = minitorch.make_tensor_backend(minitorch.FastOps)
+
+
+def timeit(f, *vals):
+    f(*vals)  # compile / warm up
+    repeats = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            f(*vals)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.2:
+            return elapsed / repeats
+        repeats *= 2
+
+
+print(f"{'size':>6s} {'minitorch':>12s} {'numpy':>12s}")
+for n in args.SIZES:
+    shape = (args.BATCH, n, n)
+    a = minitorch.rand(shape, backend=FastTensorBackend)
+    b = minitorch.rand(shape, backend=FastTensorBackend)
+    a_np, b_np = a.to_numpy(), b.to_numpy()
+    flops = 2.0 * args.BATCH * n ** 3
+
+    t_mini = timeit(minitorch.FastOps.matrix_multiply, a, b)
+    t_np = timeit(np.matmul, a_np, b_np)
+    print(f"{n:6d} {flops / t_mini / 1e9:8.2f} GF/s {flops / t_np / 1e9:8.2f} GF/s")
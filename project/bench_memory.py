@@ -0,0 +1,54 @@
+"""
+Peak scratch memory of the FastOps map and zip kernels on the indexed path.
+
+The inputs and outputs are allocated first, then the growth of the process
+high-water mark (`ru_maxrss`) while the kernels run is reported. That growth
+is the temporary memory the kernels allocate for their index buffers.
+
+>>> python project/bench_memory.py --SIZE 10000000
+"""
+import argparse
+import resource
+
+import numpy as np
+from numba import njit
+
+import minitorch
+from minitorch.fast_ops import tensor_map, tensor_zip
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--SIZE", type=int, default=10000000, help="number of elements")
+args = parser.parse_args()
+
+N = args.SIZE
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+fmap = tensor_map(njit()(minitorch.operators.neg))
+fzip = tensor_zip(njit()(minitorch.operators.add))
+
+# Broadcasting (N,) to (1, N) forces the indexed path.
+flat = (np.array([N]), np.array([1]))
+wide = (np.array([1, N]), np.array([N, 1]))
+
+# Compile on a small input so compilation does not show up below.
+small = (np.array([1, 2]), np.array([2, 1]))
+fmap(np.zeros(2), *small, np.zeros(2), np.array([2]), np.array([1]))
+fzip(np.zeros(2), *small, np.zeros(2), *small, np.zeros(2), *small)
+
+a = np.random.random(N)
+b = np.random.random(N)
+out = np.ones(N)  # touch the pages before measuring
+
+before = max_rss_mb()
+fmap(out, *wide, a, *flat)
+after_map = max_rss_mb()
+fzip(out, *wide, a, *flat, b, *flat)
+after_zip = max_rss_mb()
+
+print(f"{N} elements, tensors take {3 * N * 8 / 2 ** 20:.0f} MB")
+print(f"map scratch memory {after_map - before:8.1f} MB")
+print(f"zip scratch memory {after_zip - after_map:8.1f} MB")
@@ -0,0 +1,67 @@
+"""
+Stream a feature matrix from a memory-mapped file through the forward pass of
+an MLP, one slice of rows at a time. The file is created on the first run and
+can be larger than memory.
+
+Reports the throughput and the peak of the memory allocated by minitorch and
+numpy, which does not include the pages of the file.
+
+>>> python project/bench_mmap.py --GB 8 --FEATURES 256 --BATCH 8192
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--PATH", default="features.bin", help="feature file")
+parser.add_argument("--GB", type=float, default=8, help="size of the file")
+parser.add_argument("--FEATURES", type=int, default=256, help="features per row")
+parser.add_argument("--HIDDEN", type=int, default=64, help="number of hiddens")
+parser.add_argument("--BATCH", type=int, default=8192, help="rows per batch")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+DTYPE = np.float32
+row_bytes = args.FEATURES * np.dtype(DTYPE).itemsize
+rows = int(args.GB * 2 ** 30) // row_bytes
+
+if not os.path.exists(args.PATH) or os.path.getsize(args.PATH) != rows * row_bytes:
+    generator = np.random.default_rng(0)
+    with open(args.PATH, "wb") as f:
+        for start in range(0, rows, args.BATCH):
+            n = min(args.BATCH, rows - start)
+            generator.random((n, args.FEATURES), dtype=DTYPE).tofile(f)
+
+w1 = minitorch.rand((args.FEATURES, args.HIDDEN), backend=BACKEND, dtype=DTYPE)
+w2 = minitorch.rand((args.HIDDEN, 1), backend=BACKEND, dtype=DTYPE)
+
+
+@minitorch.no_grad()
+def forward(x):
+    return ((x @ (w1 - 0.5)).relu() @ (w2 - 0.5)).sigmoid().sum()
+
+
+X = minitorch.load_mmap(args.PATH, (rows, args.FEATURES), BACKEND, DTYPE)
+forward(X[0:2])  # compile for read-only storage
+
+tracemalloc.start()
+start = time.perf_counter()
+total = 0.0
+for first in range(0, rows, args.BATCH):
+    # a view of the rows, nothing is copied
+    total += forward(X[first : first + args.BATCH])[0]
+elapsed = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+
+size = rows * row_bytes
+print(
+    f"{size / 2 ** 30:6.2f} GB {rows} rows in {elapsed:7.2f} s"
+    f" {size / 2 ** 30 / elapsed:6.2f} GB/s"
+    f" peak allocated {peak / 2 ** 20:7.1f} MB (sum {total:.1f})"
+)
@@ -0,0 +1,92 @@
+"""
+Forward-only evaluation with and without `minitorch.no_grad`, for a tensor MLP
+and for a chain of Scalar operations.
+
+Reports the time per forward pass and the memory that stays reachable from
+the output, i.e. the recorded graph with its saved values.
+
+>>> python project/bench_no_grad.py --PTS 10000 --HIDDEN 100
+"""
+import argparse
+import time
+import tracemalloc
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--PTS", type=int, default=10000, help="number of points")
+parser.add_argument("--HIDDEN", type=int, default=100, help="number of hiddens")
+parser.add_argument("--REPEATS", type=int, default=10, help="timed runs")
+parser.add_argument("--OPS", type=int, default=100000, help="scalar operations")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+
+
+class Linear(minitorch.Module):
+    def __init__(self, in_size, out_size):
+        super().__init__()
+        self.weights = minitorch.Parameter(
+            minitorch.rand((in_size, out_size), backend=BACKEND)
+        )
+        self.bias = minitorch.Parameter(minitorch.rand((out_size,), backend=BACKEND))
+
+    def forward(self, x):
+        return x @ self.weights.value + self.bias.value
+
+
+class Network(minitorch.Module):
+    def __init__(self):
+        super().__init__()
+        self.layer1 = Linear(2, args.HIDDEN)
+        self.layer2 = Linear(args.HIDDEN, args.HIDDEN)
+        self.layer3 = Linear(args.HIDDEN, 1)
+
+    def forward(self, x):
+        x = self.layer1(x).relu()
+        x = self.layer2(x).relu()
+        return self.layer3(x).sigmoid()
+
+
+model = Network()
+X = minitorch.rand((args.PTS, 2), backend=BACKEND)
+model.forward(X)  # compile
+
+
+w = minitorch.Scalar(0.5)
+w.requires_grad_(True)
+
+
+def scalar_forward():
+    y = w
+    for _ in range(args.OPS):
+        y = y * 1.0001 + w
+    return y
+
+
+def run(forward, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        forward()
+    per_step = (time.perf_counter() - start) / repeats
+
+    tracemalloc.start()
+    out = forward()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del out
+    return per_step, retained
+
+
+for name, forward, repeats in [
+    ("mlp", lambda: model.forward(X), args.REPEATS),
+    ("scalar", scalar_forward, 1),
+]:
+    grad = run(forward, repeats)
+    with minitorch.no_grad():
+        no_grad = run(forward, repeats)
+    for mode, (per_step, retained) in [("grad", grad), ("no_grad", no_grad)]:
+        print(
+            f"{name:6s} {mode:8s} {per_step * 1000:9.2f} ms/forward"
+            f" {retained / 2 ** 20:8.2f} MB kept"
+        )
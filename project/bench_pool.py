@@ -0,0 +1,58 @@
+"""
+Training steps of an MLP with the storage pool turned on and off, with the
+pool statistics of the steady state.
+
+>>> python project/bench_pool.py --PTS 1000 --HIDDEN 500
+"""
+import argparse
+import time
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--PTS", type=int, default=1000, help="number of points")
+parser.add_argument("--HIDDEN", type=int, default=500, help="number of hiddens")
+parser.add_argument("--STEPS", type=int, default=20, help="timed steps")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+pool = minitorch.storage_pool
+
+
+def param(*shape):
+    return minitorch.Parameter(minitorch.rand(shape, backend=BACKEND) - 0.5)
+
+
+w1, b1 = param(2, args.HIDDEN), param(args.HIDDEN)
+w2, b2 = param(args.HIDDEN, args.HIDDEN), param(args.HIDDEN)
+w3, b3 = param(args.HIDDEN, 1), param(1)
+params = [w1, b1, w2, b2, w3, b3]
+X = minitorch.rand((args.PTS, 2), backend=BACKEND)
+
+
+def step():
+    h = (X @ w1.value + b1.value).relu()
+    h = (h @ w2.value + b2.value).relu()
+    out = (h @ w3.value + b3.value).sigmoid()
+    out.sum().view(1).backward()
+    for p in params:
+        p.value.sub_(p.value.grad.mul_(0.01 / args.PTS))
+        p.value.zero_grad_()
+
+
+step()  # compile
+for name, max_bytes in [("off", 0), ("on", 2 ** 30)]:
+    pool.max_bytes = max_bytes
+    pool.flush()
+    step()  # fill the pool
+    pool.reset_stats()
+    start = time.perf_counter()
+    for _ in range(args.STEPS):
+        step()
+    per_step = (time.perf_counter() - start) / args.STEPS
+    stats = pool.stats()
+    print(
+        f"pool {name:3s} {per_step * 1000:8.2f} ms/step"
+        f" hits {stats['hits']:6d} misses {stats['misses']:6d}"
+        f" held {stats['bytes_held'] / 2 ** 20:7.1f} MB"
+    )
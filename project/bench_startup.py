@@ -0,0 +1,55 @@
+"""
+Time to the first forward pass of a fresh process with the FastOps backend,
+with an empty kernel cache (cold) and with the cache of the previous run (warm).
+
+Each run starts a new interpreter with NUMBA_CACHE_DIR set to a temporary
+directory and measures import, backend creation, `FastOps.warmup` and one
+forward pass of an MLP.
+
+>>> python project/bench_startup.py --RUNS 2
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--RUNS", type=int, default=2, help="warm runs")
+parser.add_argument("--CHILD", action="store_true", help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+
+def first_forward():
+    start = time.perf_counter()
+    import minitorch
+
+    backend = minitorch.make_tensor_backend(minitorch.FastOps)
+    minitorch.FastOps.warmup()
+    ready = time.perf_counter()
+
+    x = minitorch.rand((100, 2), backend=backend)
+    w1 = minitorch.rand((2, 10), backend=backend)
+    w2 = minitorch.rand((10, 1), backend=backend)
+    out = ((x @ w1).relu() @ w2).sigmoid().sum()
+    out[0]
+    end = time.perf_counter()
+    print(f"{ready - start:9.2f} s to warm up {end - start:9.2f} s to first forward")
+
+
+if args.CHILD:
+    first_forward()
+    sys.exit()
+
+with tempfile.TemporaryDirectory() as cache:
+    env = dict(os.environ, NUMBA_CACHE_DIR=cache)
+    for run in ["cold"] + ["warm"] * args.RUNS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--CHILD"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        print(f"{run:5s} {out.stdout.strip()}")
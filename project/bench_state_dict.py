@@ -0,0 +1,82 @@
+"""
+Save the parameters of an MLP with `minitorch.save` and load them back, memory
+mapped with `minitorch.load` and, for comparison, read into memory.
+
+>>> python project/bench_state_dict.py --HIDDEN 4096 --LAYERS 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--PATH", default="model.bin", help="state file")
+parser.add_argument("--HIDDEN", type=int, default=4096, help="number of hiddens")
+parser.add_argument("--LAYERS", type=int, default=8, help="number of layers")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+
+
+class Linear(minitorch.Module):
+    def __init__(self, in_size, out_size):
+        super().__init__()
+        self.weights = minitorch.Parameter(
+            minitorch.zeros((in_size, out_size), backend=BACKEND)
+        )
+        self.bias = minitorch.Parameter(minitorch.zeros((out_size,), backend=BACKEND))
+
+    def forward(self, x):
+        return x @ self.weights.value + self.bias.value
+
+
+class Network(minitorch.Module):
+    def __init__(self):
+        super().__init__()
+        for i in range(args.LAYERS):
+            setattr(self, f"layer{i}", Linear(args.HIDDEN, args.HIDDEN))
+
+    def forward(self, x):
+        for layer in self.modules():
+            x = layer.forward(x).relu()
+        return x
+
+
+def timed(f):
+    start = time.perf_counter()
+    out = f()
+    return out, (time.perf_counter() - start) * 1000
+
+
+model = Network()
+_, ms = timed(lambda: minitorch.save(model.state_dict(), args.PATH))
+print(f"save {os.path.getsize(args.PATH) / 2 ** 20:8.1f} MB {ms:9.2f} ms")
+
+x = minitorch.rand((1, args.HIDDEN), backend=BACKEND)
+# compile, also for the read-only arrays of the mapped file
+model.forward(x)
+mapped = minitorch.load(args.PATH, backend=BACKEND)
+(x @ mapped["layer0.weights"] + mapped["layer0.bias"]).relu()
+del mapped
+
+
+def read():
+    return {
+        k: minitorch.Tensor.from_numpy(np.array(t.to_numpy()), backend=BACKEND)
+        for k, t in minitorch.load(args.PATH).items()
+    }
+
+
+for name, load in [("mmap", lambda: minitorch.load(args.PATH)), ("read", read)]:
+    other = Network()
+    # drop the pages of the file from the cache where possible
+    with open(args.PATH, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    _, ms = timed(lambda: other.load_state_dict(load()))
+    _, forward = timed(lambda: other.forward(x))
+    print(f"load {name} {ms:9.2f} ms, first forward {forward:9.2f} ms")
+os.remove(args.PATH)
@@ -0,0 +1,80 @@
+"""
+Memory allocated by one SGD parameter update of an MLP, written with the
+arithmetic operators (a new tensor per operation), with the in-place
+methods `mul_` / `sub_` and with the fused steps of `minitorch.optim`.
+
+>>> python project/bench_update.py --HIDDEN 1000
+"""
+import argparse
+import time
+import tracemalloc
+
+import minitorch
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--HIDDEN", type=int, default=1000, help="number of hiddens")
+parser.add_argument("--RATE", type=float, default=0.05, help="learning rate")
+parser.add_argument("--REPEATS", type=int, default=10, help="timed runs")
+args = parser.parse_args()
+
+BACKEND = minitorch.make_tensor_backend(minitorch.FastOps)
+shapes = [(2, args.HIDDEN), (args.HIDDEN,), (args.HIDDEN, args.HIDDEN), (args.HIDDEN,)]
+params = [minitorch.Parameter(minitorch.rand(s, backend=BACKEND)) for s in shapes]
+
+
+def set_grads():
+    for p in params:
+        grad = minitorch.rand(p.value.shape, backend=BACKEND)
+        if p.value.grad is None:
+            p.value._derivative = grad
+        else:
+            # keep the buffers of the optimizers
+            p.value.grad.to_numpy()[...] = grad.to_numpy()
+
+
+def out_of_place():
+    for p in params:
+        p.update(p.value - args.RATE * p.value.grad)
+
+
+def in_place():
+    for p in params:
+        p.value.sub_(p.value.grad.mul_(args.RATE))
+
+
+def optimizer_step(optimizer):
+    def step():
+        optimizer.step()
+
+    return step
+
+
+set_grads()
+steps = [
+    ("out-of-place", out_of_place),
+    ("in-place", in_place),
+    ("optim.SGD", optimizer_step(minitorch.optim.SGD(params, lr=args.RATE))),
+    (
+        "momentum",
+        optimizer_step(minitorch.optim.SGD(params, lr=args.RATE, momentum=0.9)),
+    ),
+    ("optim.Adam", optimizer_step(minitorch.optim.Adam(params, lr=args.RATE))),
+]
+for name, step in steps:
+    set_grads()
+    step()  # compile
+    elapsed = 0.0
+    for _ in range(args.REPEATS):
+        set_grads()
+        start = time.perf_counter()
+        step()
+        elapsed += time.perf_counter() - start
+    set_grads()
+    tracemalloc.start()
+    step()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{name:12s} {elapsed / args.REPEATS * 1000:8.2f} ms/step"
+        f" {peak / 2 ** 20:8.2f} MB allocated"
+    )
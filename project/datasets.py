@@ -1,5 +1,4 @@
 import numpy
-import random
 import visdom
 import numpy as np
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
@@ -13,12 +12,8 @@ def to_fig(canvas):
 
 
 def make_pts(N):
-    X = []
-    for i in range(N):
-        x_1 = random.random()
-        x_2 = random.random()
-        X.append((x_1, x_2))
-    return X
+    "N random points in the unit square, array of shape (N, 2)"
+    return np.random.random((N, 2))
 
 
 class Graph:
@@ -59,9 +54,7 @@ class Graph:
             Z = numpy.array(Z)
             ax.contourf(X, Y, Z)
 
-        ax.scatter(
-            [p[0] for p in self.X], [p[1] for p in self.X], c=self.y, edgecolors="black"
-        )
+        ax.scatter(self.X[:, 0], self.X[:, 1], c=self.y, edgecolors="black")
         # plt.savefig(outfile)
         ax.set_title(outfile)
         im = to_fig(canvas)
@@ -78,10 +71,8 @@ class Simple(Graph):
         super().__init__(vis, vis_args)
         self.N = N
         self.X = make_pts(N)
-        self.y = []
-        for x_1, x_2 in self.X:
-            y = 1 if x_1 < 0.5 else 0
-            self.y.append(y)
+        x_1 = self.X[:, 0]
+        self.y = (x_1 < 0.5).astype(int)
 
 
 class Split(Graph):
@@ -89,10 +80,8 @@ class Split(Graph):
         super().__init__(vis, vis_args)
         self.N = N
         self.X = make_pts(N)
-        self.y = []
-        for x_1, x_2 in self.X:
-            y = 1 if x_1 < 0.2 or x_1 > 0.8 else 0
-            self.y.append(y)
+        x_1 = self.X[:, 0]
+        self.y = ((x_1 < 0.2) | (x_1 > 0.8)).astype(int)
 
 
 class Xor(Graph):
@@ -100,7 +89,5 @@ class Xor(Graph):
         super().__init__(vis, vis_args)
         self.N = N
         self.X = make_pts(N)
-        self.y = []
-        for x_1, x_2 in self.X:
-            y = 1 if ((x_1 < 0.5 and x_2 > 0.5) or (x_1 > 0.5 and x_2 < 0.5)) else 0
-            self.y.append(y)
+        x_1, x_2 = self.X[:, 0], self.X[:, 1]
+        self.y = (((x_1 < 0.5) & (x_2 > 0.5)) | ((x_1 > 0.5) & (x_2 < 0.5))).astype(int)
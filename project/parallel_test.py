@@ -1,3 +1,4 @@
+import numpy as np
 import minitorch.fast_ops
 import minitorch
 from numba import njit
@@ -22,7 +23,7 @@ print("REDUCE")
 out, a = minitorch.zeros((1,)), minitorch.zeros((10,))
 treduce = minitorch.fast_ops.tensor_reduce(njit()(minitorch.operators.add))
 
-treduce(*out.tuple(), *a.tuple(), (10,), 10)
+treduce(*out.tuple(), *a.tuple(), np.array([10]), 10)
 print(treduce.parallel_diagnostics(level=3))
 
 
@@ -33,7 +34,8 @@ out, a, b = (
     minitorch.zeros((10, 20)),
     minitorch.zeros((20, 10)),
 )
-tmm = minitorch.fast_ops.tensor_matrix_multiply
+# diagnostics need a fresh compile, not the disk cached kernel
+tmm = njit(parallel=True)(minitorch.fast_ops.tensor_matrix_multiply.py_func)
 
 tmm(*out.tuple(), *a.tuple(), *b.tuple())
 print(tmm.parallel_diagnostics(level=3))
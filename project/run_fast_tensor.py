@@ -8,6 +8,7 @@ parser = argparse.ArgumentParser()
 parser.add_argument("--PTS", type=int, default=50, help="number of points")
 parser.add_argument("--HIDDEN", type=int, default=10, help="number of hiddens")
 parser.add_argument("--RATE", type=float, default=0.5, help="learning rate")
+parser.add_argument("--BATCH", type=int, default=10, help="batch size")
 parser.add_argument("--BACKEND", default="cpu", help="backend mode")
 parser.add_argument("--DATASET", default="xor", help="dataset")
 parser.add_argument("--PLOT", default=False, help="dataset")
@@ -59,8 +60,9 @@ class Network(minitorch.Module):
         self.layer3 = Linear(HIDDEN, 1)
 
     def forward(self, x):
-        # TODO: Implement for Task 3.5.
-        raise NotImplementedError('Need to implement for Task 3.5')
+        x = self.layer1(x).relu()
+        x = self.layer2(x).relu()
+        return self.layer3(x).sigmoid()
 
 
 class Linear(minitorch.Module):
@@ -71,40 +73,57 @@ class Linear(minitorch.Module):
         self.out_size = out_size
 
     def forward(self, x):
-        # TODO: Implement for Task 3.5.
-        raise NotImplementedError('Need to implement for Task 3.5')
+        return x @ self.weights.value + self.bias.value
 
 
 model = Network()
 data = DATASET
 
-X = minitorch.tensor_fromlist(data.X, backend=BACKEND)
+X = minitorch.from_numpy(data.X, backend=BACKEND)
 y = minitorch.tensor(data.y, backend=BACKEND)
+loader = minitorch.DataLoader(X, y, batch_size=args.BATCH, shuffle=True)
+optimizer = minitorch.optim.SGD(model.parameters(), lr=RATE / args.BATCH)
 
 
+def train_step(X_batch, y_batch):
+    # Forward
+    out = model.forward(X_batch).view(y_batch.shape[0])
+    prob = (out * y_batch) + (out - 1.0) * (y_batch - 1.0)
+    loss = -prob.log().sum().view(1)
+    loss.backward()
+
+    # Update
+    optimizer.step()
+    optimizer.zero_grad()
+    return loss
+
+
+# Full batches replay the captured kernels of a step, the last one of an epoch
+# can be smaller and runs the step itself
+graph = None
 losses = []
 for epoch in range(250):
     total_loss = 0.0
 
     start = time.time()
 
-    # Forward
-    out = model.forward(X).view(data.N)
-    prob = (out * y) + (out - 1.0) * (y - 1.0)
-    loss = -prob.log()
-    (loss.sum().view(1)).backward()
-    total_loss += loss[0]
-    losses.append(total_loss)
-
-    # Update
-    for p in model.parameters():
-        if p.value.grad is not None:
-            p.update(p.value - RATE * (p.value.grad / float(data.N)))
+    for X_batch, y_batch in loader:
+        if X_batch.shape[0] != args.BATCH:
+            loss = train_step(X_batch, y_batch)
+        elif graph is None:
+            graph = minitorch.capture(train_step, X_batch, y_batch, warmup=0)
+            loss = graph.outputs
+        else:
+            loss = graph(X_batch, y_batch)
+        total_loss += loss[0]
 
+    losses.append(total_loss)
     epoch_time = time.time() - start
 
     # Logging
     if epoch % 10 == 0:
+        with minitorch.no_grad():
+            out = model.forward(X).view(data.N)
         correct = 0
         for i, lab in enumerate(data.y):
             if lab == 1 and out[i] > 0.5:
@@ -124,6 +143,7 @@ for epoch in range(250):
         )
         im = f"Epoch: {epoch}"
 
+        @minitorch.no_grad()
         def plot(x):
             return model.forward(minitorch.tensor(x, (1, 2), backend=BACKEND))[0, 0]
 
@@ -7,6 +7,7 @@ PTS = 50
 DATASET = datasets.Xor(PTS, vis=True)
 HIDDEN = 20
 RATE = 0.1
+BATCH = 10
 
 
 def RParam(*shape):
@@ -52,8 +53,10 @@ class Linear(minitorch.Module):
 model = Network()
 data = DATASET
 
-X = minitorch.tensor_fromlist(data.X)
+X = minitorch.from_numpy(data.X)
 y = minitorch.tensor(data.y)
+loader = minitorch.DataLoader(X, y, batch_size=BATCH, shuffle=True)
+optimizer = minitorch.optim.SGD(model.parameters(), lr=RATE / BATCH)
 
 losses = []
 for epoch in range(250):
@@ -61,26 +64,26 @@ for epoch in range(250):
     correct = 0
     start = time.time()
 
-    # Forward
-    out = model.forward(X).view(data.N)
+    for X_batch, y_batch in loader:
+        # Forward
+        out = model.forward(X_batch).view(y_batch.shape[0])
 
-    prob = (out * y) + (out - 1.0) * (y - 1.0)
-    for i, lab in enumerate(data.y):
-        if lab == 1 and out[i] > 0.5:
-            correct += 1
-        if lab == 0 and out[i] < 0.5:
-            correct += 1
+        prob = (out * y_batch) + (out - 1.0) * (y_batch - 1.0)
+        for i in range(y_batch.shape[0]):
+            if y_batch[i] == 1 and out[i] > 0.5:
+                correct += 1
+            if y_batch[i] == 0 and out[i] < 0.5:
+                correct += 1
 
-    loss = -prob.log()
-    (loss.sum().view(1)).backward()
-    total_loss += loss[0]
-    losses.append(total_loss)
+        loss = -prob.log().sum().view(1)
+        loss.backward()
+        total_loss += loss[0]
 
-    # Update
-    for p in model.parameters():
-        if p.value.grad is not None:
-            p.update(p.value - RATE * (p.value.grad / float(data.N)))
+        # Update
+        optimizer.step()
+        optimizer.zero_grad()
 
+    losses.append(total_loss)
     epoch_time = time.time() - start
 
     # Logging
@@ -27,12 +27,13 @@ class GraphBuilder:
     def get_name(self, x):
         if not isinstance(x, minitorch.Variable):
             return "constant %s" % (x,)
-        elif len(x.name) > 15:
-            if x.name in self.intermediates:
-                return "h%d" % (self.intermediates[x.name],)
+        elif x._name is None:
+            # intermediate without a user given name
+            if x.unique_id in self.intermediates:
+                return "h%d" % (self.intermediates[x.unique_id],)
             else:
                 self.hid = self.hid + 1
-                self.intermediates[x.name] = self.hid
+                self.intermediates[x.unique_id] = self.hid
                 return "h%d" % (self.hid,)
         else:
             return x.name
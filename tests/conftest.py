@@ -3,7 +3,8 @@ import pytest
 from hypothesis import settings
 
 
-settings.register_profile("minitorch", print_blob=True)
+# numba compiles the kernels on their first call, which exceeds the default deadline
+settings.register_profile("minitorch", deadline=None, print_blob=True)
 settings.load_profile("minitorch")
 
 # Not sure what this is doing
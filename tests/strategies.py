@@ -73,7 +73,9 @@ def shaped_tensors(
 
 @composite
 def matmul_tensors(
-    draw, numbers=floats(allow_nan=False, min_value=-100, max_value=100)
+    draw,
+    numbers=floats(allow_nan=False, min_value=-100, max_value=100),
+    backend=minitorch.TensorFunctions,
 ):
 
     i, j, k = [draw(integers(min_value=1, max_value=10)) for _ in range(3)]
@@ -84,7 +86,9 @@ def matmul_tensors(
     for shape in [l1, l2]:
         size = int(minitorch.prod(shape))
         data = draw(lists(numbers, min_size=size, max_size=size))
-        values.append(minitorch.Tensor(minitorch.TensorData(data, shape)))
+        values.append(
+            minitorch.Tensor(minitorch.TensorData(data, shape), backend=backend)
+        )
     return values
 
 
@@ -82,5 +82,35 @@ def test_backprop():
     assert var0.derivative == 10
 
 
+@pytest.mark.task1_4
+def test_backprop_deep():
+    "Graphs deeper than the recursion limit, with nodes that are used twice."
+    var = Variable(History())
+    out = var
+    for i in range(5000):
+        inputs = [out, out] if i % 100 == 0 else [0, out]
+        out = Variable(History(Temp, None, inputs))
+    out.backward(1)
+    assert var.derivative == 2 ** 50
+
+
+def test_no_grad():
+    x = minitorch.Scalar(2.0)
+    x.requires_grad_(True)
+    with minitorch.no_grad():
+        assert not minitorch.is_grad_enabled()
+        y = x * x + 1.0
+    assert minitorch.is_grad_enabled()
+    assert y.data == 5.0
+    assert y.history is None
+
+    y = x * x
+    y.backward()
+    assert x.derivative == 4.0
+
+    x.requires_grad_(False)
+    assert (x * x).history is None
+
+
 test_backprop()
 
@@ -0,0 +1,64 @@
+import threading
+import numpy as np
+import minitorch
+import pytest
+
+
+def dataset(n):
+    X = minitorch.tensor_fromlist([[float(i), -float(i)] for i in range(n)])
+    y = minitorch.tensor([float(i) for i in range(n)])
+    return X, y
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_batches(prefetch):
+    X, y = dataset(10)
+    loader = minitorch.DataLoader(X, y, batch_size=4, prefetch=prefetch)
+    assert len(loader) == 3
+    batches = list(loader)
+    assert [b[0].shape for b in batches] == [(4, 2), (4, 2), (2, 2)]
+    # views of the dataset
+    assert np.shares_memory(batches[1][0].to_numpy(), X.to_numpy())
+    assert batches[2][1].to_numpy().tolist() == [8.0, 9.0]
+
+    loader.drop_last = True
+    assert len(loader) == 2
+    assert len(list(loader)) == 2
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_shuffle(prefetch):
+    X, y = dataset(10)
+    loader = minitorch.DataLoader(
+        X, y, batch_size=3, shuffle=True, prefetch=prefetch, generator=1
+    )
+    epochs = []
+    for _ in range(2):
+        seen = []
+        for x_batch, y_batch in loader:
+            # examples stay aligned across the tensors
+            assert (x_batch.to_numpy()[:, 0] == y_batch.to_numpy()).all()
+            seen.extend(y_batch.to_numpy().tolist())
+        assert sorted(seen) == [float(i) for i in range(10)]
+        epochs.append(seen)
+    assert epochs[0] != epochs[1]
+
+
+def test_prefetch_stops():
+    "The prefetch thread ends with the loop and passes on errors."
+    X, y = dataset(100)
+    threads = threading.active_count()
+    loader = minitorch.DataLoader(X, y, batch_size=1, prefetch=2)
+    for i, _ in enumerate(loader):
+        if i == 3:
+            break
+    assert threading.active_count() == threads
+
+    def failing():
+        yield (X[0:1], y[0:1])
+        raise ValueError("bad batch")
+
+    loader._batches = failing
+    with pytest.raises(ValueError):
+        list(loader)
+    assert threading.active_count() == threads
@@ -0,0 +1,90 @@
+import numpy as np
+import minitorch
+import pytest
+
+FastTensorBackend = minitorch.make_tensor_backend(minitorch.FastOps)
+backends = [
+    pytest.param(minitorch.TensorFunctions, id="tensor_ops"),
+    pytest.param(FastTensorBackend, id="fast_ops"),
+]
+
+
+def trainer(backend, optimizer, dtype):
+    "A training step of a small MLP, with parameters from a fixed seed"
+    generator = np.random.default_rng(0)
+    shapes = [(3, 4), (4,), (4, 1), (1,)]
+    params = [
+        minitorch.Parameter(
+            minitorch.rand(s, backend, generator=generator, dtype=dtype) - 0.5
+        )
+        for s in shapes
+    ]
+    w1, b1, w2, b2 = params
+    opt = optimizer(params, lr=0.1)
+
+    def step(x, y):
+        h = (x @ w1.value + b1.value).relu()
+        out = (h @ w2.value + b2.value).sigmoid().view(y.shape[0])
+        loss = ((out - y) * (out - y)).mean().view(1)
+        loss.backward()
+        opt.step()
+        opt.zero_grad()
+        return loss
+
+    return params, step
+
+
+def batches(backend, n):
+    generator = np.random.default_rng(1)
+    return [
+        (
+            minitorch.rand((5, 3), backend, generator=generator),
+            minitorch.rand((5,), backend, generator=generator),
+        )
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("backend", backends)
+@pytest.mark.parametrize("optimizer", [minitorch.optim.SGD, minitorch.optim.Adam])
+# float32 parameters with float64 inputs cast their gradients
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_replay(backend, optimizer, dtype):
+    data = batches(backend, 5)
+    eager_params, eager_step = trainer(backend, optimizer, dtype)
+    params, step = trainer(backend, optimizer, dtype)
+
+    # capturing runs the warmup and the captured call, two real steps
+    graph = minitorch.capture(step, *data[0], warmup=1)
+    eager_step(*data[0])
+    eager_step(*data[0])
+    for x, y in data[1:]:
+        loss = graph(x, y)
+        expected = eager_step(x, y)
+        assert loss is graph.outputs
+        assert np.allclose(loss.to_numpy(), expected.to_numpy())
+    for p, q in zip(params, eager_params):
+        assert p.value.dtype == dtype
+        assert np.allclose(p.value.to_numpy(), q.value.to_numpy())
+
+
+def test_inputs():
+    data = minitorch.rand((4, 3))
+    x = data[0:2]
+    graph = minitorch.capture(lambda x: (x * 2.0).sum(1), x, warmup=0)
+    assert not np.shares_memory(graph.inputs[0].to_numpy(), data.to_numpy())
+    out = graph(data[2:4])
+    assert np.allclose(out.to_numpy()[:, 0], 2 * data.to_numpy()[2:4].sum(1))
+    # the example inputs are unchanged
+    assert np.array_equal(x.to_numpy(), data.to_numpy()[0:2])
+    with pytest.raises(AssertionError):
+        graph(data)
+
+
+def test_launch_records_while_capturing():
+    a = minitorch.rand((2, 2))
+    graph = minitorch.capture(lambda a: a.relu(), a, warmup=0)
+    assert len(graph.ops) == 1
+    # nothing recorded outside of a capture
+    (a + a).sum()
+    assert len(graph.ops) == 1
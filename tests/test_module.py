@@ -0,0 +1,136 @@
+import numpy as np
+import minitorch
+import pytest
+
+
+class Linear(minitorch.Module):
+    def __init__(self, in_size, out_size):
+        super().__init__()
+        generator = np.random.default_rng(in_size)
+        self.weights = minitorch.Parameter(
+            minitorch.rand((in_size, out_size), generator=generator)
+        )
+        self.bias = self.add_parameter(
+            "bias", minitorch.rand((out_size,), generator=generator)
+        )
+
+    def forward(self, x):
+        return x @ self.weights.value + self.bias.value
+
+
+class Network(minitorch.Module):
+    def __init__(self):
+        super().__init__()
+        self.layer1 = Linear(3, 4)
+        self.layer2 = Linear(4, 1)
+
+    def forward(self, x):
+        return self.layer2.forward(self.layer1.forward(x).relu())
+
+
+def test_registry():
+    model = Network()
+    names = ["layer1.weights", "layer1.bias", "layer2.weights", "layer2.bias"]
+    assert list(model.named_parameters()) == names
+    # cached until a parameter or module is set
+    registry = model._named_parameters()
+    assert model._named_parameters() is registry
+    model.mode = "eval"
+    assert model._named_parameters() is registry
+
+    model.layer2.scale = minitorch.Parameter(minitorch.tensor([2.0]))
+    assert list(model.named_parameters()) == names + ["layer2.scale"]
+    model.layer3 = Linear(1, 1)
+    assert len(model.named_parameters()) == 7
+    assert len(model.layer1.parameters()) == 2
+    assert model._named_parameters() is not registry
+
+    # the returned dict is a copy
+    model.named_parameters().clear()
+    assert len(model.parameters()) == 7
+
+
+def test_flat_parameters():
+    model = Network()
+    x = minitorch.rand((5, 3))
+    expected = model.forward(x).to_numpy().copy()
+    flat = model.flat_parameters()
+    assert flat.shape == (3 * 4 + 4 + 4 * 1 + 1,)
+    assert np.array_equal(model.forward(x).to_numpy(), expected)
+    for p in model.parameters():
+        assert p.value._tensor._storage.base is flat._tensor._storage
+        assert p.value.grad._tensor._storage.base is flat.grad._tensor._storage
+
+    model.forward(x).sum().view(1).backward()
+    grads = [p.value.grad.to_numpy().ravel() for p in model.parameters()]
+    assert np.array_equal(flat.grad.to_numpy(), np.concatenate(grads))
+    flat.zero_grad_()
+    assert not model.layer1.weights.value.grad.to_numpy().any()
+
+    # again without copying, and shared with an optimizer
+    assert model.flat_parameters()._tensor._storage is flat._tensor._storage
+    optimizer = minitorch.optim.SGD(model.parameters(), lr=0.5)
+    assert optimizer._values is flat._tensor._storage
+    model.forward(x).sum().view(1).backward()
+    before = flat.to_numpy().copy()
+    optimizer.step()
+    assert np.allclose(flat.to_numpy(), before - 0.5 * flat.grad.to_numpy())
+
+
+def test_flat_scalar_parameters():
+    model = minitorch.Module()
+    model.add_parameter("x", 1.0)
+    with pytest.raises(AssertionError):
+        model.flat_parameters()
+
+
+def test_state_dict(tmp_path):
+    model = Network()
+    x = minitorch.rand((5, 3))
+    expected = model.forward(x).to_numpy().copy()
+    path = str(tmp_path / "model.bin")
+    minitorch.save(model.state_dict(), path)
+
+    loaded = minitorch.load(path)
+    assert list(loaded) == list(model.named_parameters())
+    other = Network()
+    other.layer1 = Linear(3, 4)
+    other.load_state_dict(loaded)
+    assert np.array_equal(other.forward(x).to_numpy(), expected)
+    # the parameters use the mapped file
+    for p, t in zip(other.parameters(), loaded.values()):
+        assert p.value._tensor is t._tensor
+        assert isinstance(p.value._tensor._storage, np.memmap)
+        assert p.value._tensor._storage.ctypes.data % 64 == 0
+    with pytest.raises(ValueError):
+        other.layer1.bias.value.add_(minitorch.tensor([1.0] * 4))
+
+    del loaded["layer1.bias"]
+    with pytest.raises(AssertionError):
+        other.load_state_dict(loaded)
+    other.load_state_dict(loaded, strict=False)
+
+
+def test_save_views(tmp_path):
+    "Strides, views and dtypes round-trip"
+    a = minitorch.rand((4, 6), dtype=np.float32)
+    tensors = {
+        "a": a,
+        "transposed": a.permute(1, 0),
+        "slice": a[1:3, 0:6:2],
+        "broadcast": minitorch.Tensor(
+            minitorch.tensor([1.0, 2.0])._tensor.broadcast_to((3, 2)),
+            backend=minitorch.TensorFunctions,
+        ),
+    }
+    path = str(tmp_path / "tensors.bin")
+    minitorch.save(tensors, path)
+    loaded = minitorch.load(path, mode="c")
+    for name, t in tensors.items():
+        assert loaded[name].dtype == t.dtype
+        assert loaded[name].shape == t.shape
+        assert loaded[name]._tensor.strides == t._tensor.strides
+        assert np.array_equal(loaded[name].to_numpy(), t.to_numpy())
+    # copy on write, the file is unchanged
+    loaded["a"].add_(loaded["a"])
+    assert np.array_equal(minitorch.load(path)["a"].to_numpy(), a.to_numpy())
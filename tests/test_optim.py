@@ -0,0 +1,102 @@
+import numpy as np
+import minitorch
+import pytest
+from .strategies import assert_close
+
+FastTensorBackend = minitorch.make_tensor_backend(minitorch.FastOps)
+backends = [
+    pytest.param(minitorch.TensorFunctions, id="tensor_ops"),
+    pytest.param(FastTensorBackend, id="fast_ops"),
+]
+
+
+def model(backend):
+    "Parameters of a small linear model and its loss on fixed data"
+    generator = np.random.default_rng(0)
+    w = minitorch.Parameter(minitorch.rand((3, 2), backend, generator=generator))
+    b = minitorch.Parameter(minitorch.rand((2,), backend, generator=generator))
+    x = minitorch.rand((4, 3), backend, generator=generator)
+
+    def loss():
+        return ((x @ w.value + b.value) * (x @ w.value)).sum().view(1)
+
+    return [w, b], loss
+
+
+def grads(params):
+    return [p.value.grad.to_numpy().copy() for p in params]
+
+
+@pytest.mark.parametrize("backend", backends)
+def test_sgd(backend):
+    params, loss = model(backend)
+    optimizer = minitorch.optim.SGD(params, lr=0.1, momentum=0.9, weight_decay=0.01)
+    values = [p.value.to_numpy().copy() for p in params]
+    velocity = [np.zeros_like(v) for v in values]
+    for _ in range(3):
+        optimizer.zero_grad()
+        loss().backward()
+        for v, vel, g in zip(values, velocity, grads(params)):
+            vel *= 0.9
+            vel += g + 0.01 * v
+            v -= 0.1 * vel
+        optimizer.step()
+        for p, v in zip(params, values):
+            assert_close(p.value.to_numpy(), v)
+
+    # all values and gradients are views of the flat buffers
+    for p in params:
+        assert p.value._tensor._storage.base is optimizer._values
+        assert p.value.grad._tensor._storage.base is optimizer._grads
+    optimizer.zero_grad()
+    assert not params[0].value.grad.to_numpy().any()
+
+
+@pytest.mark.parametrize("backend", backends)
+def test_adam(backend):
+    params, loss = model(backend)
+    optimizer = minitorch.optim.Adam(params, lr=0.01)
+    values = [p.value.to_numpy().copy() for p in params]
+    m = [np.zeros_like(v) for v in values]
+    s = [np.zeros_like(v) for v in values]
+    for t in range(1, 4):
+        optimizer.zero_grad()
+        loss().backward()
+        for v, m_, s_, g in zip(values, m, s, grads(params)):
+            m_[:] = 0.9 * m_ + 0.1 * g
+            s_[:] = 0.999 * s_ + 0.001 * g * g
+            m_hat = m_ / (1 - 0.9 ** t)
+            s_hat = s_ / (1 - 0.999 ** t)
+            v -= 0.01 * m_hat / (np.sqrt(s_hat) + 1e-8)
+        optimizer.step()
+        for p, v in zip(params, values):
+            assert_close(p.value.to_numpy(), v)
+
+
+def test_replaced_parameter():
+    "Parameters replaced with `Parameter.update` are moved into the buffers."
+    params, loss = model(minitorch.TensorFunctions)
+    optimizer = minitorch.optim.SGD(params, lr=1.0)
+    params[1].update(minitorch.tensor([1.0, 2.0]))
+    optimizer.zero_grad()
+    loss().backward()
+    expected = params[1].value.to_numpy() - params[1].value.grad.to_numpy()
+    optimizer.step()
+    assert_close(params[1].value.to_numpy(), expected)
+
+
+def test_backend_without_kernels():
+    "Ops without update kernels, e.g. CudaOps, give no optimizer"
+
+    class Ops:
+        map = minitorch.TensorOps.map
+        zip = minitorch.TensorOps.zip
+        reduce = minitorch.TensorOps.reduce
+        matrix_multiply = minitorch.TensorOps.matrix_multiply
+
+    backend = minitorch.make_tensor_backend(Ops)
+    assert backend._sgd_update is None
+    params, _ = model(backend)
+    for optimizer in [minitorch.optim.SGD, minitorch.optim.Adam]:
+        with pytest.raises(NotImplementedError):
+            optimizer(params, lr=0.1)
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from hypothesis import given
 from .strategies import scalars, assert_close
 import minitorch
@@ -17,6 +19,19 @@ def test_central_diff():
     assert_close(d, 5.0)
 
 
+def test_import_without_numba():
+    "Scalars and the Python backend do not import numba, the fast backend does."
+    code = (
+        "import sys, minitorch\n"
+        "minitorch.Scalar(1.0) * 2.0\n"
+        "minitorch.tensor([1.0, 2.0]).sum()\n"
+        "assert 'numba' not in sys.modules\n"
+        "minitorch.FastOps\n"
+        "assert 'numba' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 one_arg = [
     ("neg", lambda a: -a),
     ("addconstant", lambda a: a + 5),
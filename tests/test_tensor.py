@@ -1,8 +1,10 @@
+import tracemalloc
+import numpy as np
 import minitorch
 import pytest
 from hypothesis import given, reproduce_failure, settings
 from hypothesis.strategies import floats, lists
-from .strategies import tensors, shaped_tensors, assert_close
+from .strategies import tensors, shaped_tensors, matmul_tensors, assert_close
 
 small_floats = floats(min_value=-100, max_value=100, allow_nan=False)
 
@@ -100,6 +102,215 @@ def test_two_grad_broadcast(fn, ts):
     minitorch.grad_check(fn[1], t1, t2.sum(0))
 
 
+@given(matmul_tensors())
+def test_mm(ts):
+    a, b = ts
+    c = a @ b
+    c2 = (a.view(*a.shape, 1) * b.view(1, *b.shape)).sum(1).view(*c.shape)
+    for ind in c._tensor.indices():
+        assert_close(c[ind], c2[ind])
+    minitorch.grad_check(lambda a, b: a @ b, a, b)
+
+
+def test_backward_releases_graph():
+    "After backward only the gradient stays alive unless the graph is retained."
+
+    def retained(retain_graph):
+        x = minitorch.rand((100, 100), requires_grad=True)
+        tracemalloc.start()
+        out = ((x * x).sigmoid() * x).sum().view(1)
+        out.backward(retain_graph=retain_graph)
+        # released buffers wait in the storage pool
+        minitorch.storage_pool.flush()
+        kept = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return kept, out
+
+    grad_size = 100 * 100 * 8
+    released, out = retained(False)
+    assert released < 1.5 * grad_size
+    with pytest.raises(AssertionError):
+        out.backward()
+
+    kept, out = retained(True)
+    assert kept > 3 * grad_size
+    out.backward()
+
+
+def test_grad_buffer():
+    "Gradients accumulate in place into one buffer per leaf, without history."
+    x = minitorch.tensor([1.0, 2.0], requires_grad=True)
+    (x * x + x).sum().view(1).backward()
+    grad = x.grad
+    storage = grad._tensor._storage
+    assert grad.history is None
+    assert grad.to_numpy().tolist() == [3.0, 5.0]
+
+    (x * 3.0).sum().view(1).backward()
+    assert x.grad is grad
+    assert grad.to_numpy().tolist() == [6.0, 8.0]
+
+    x.zero_grad_()
+    assert x.grad is grad and grad._tensor._storage is storage
+    assert grad.to_numpy().tolist() == [0.0, 0.0]
+
+
+def test_expand_broadcasts():
+    "Gradients of reductions reach their inputs as stride 0 views."
+    x = minitorch.rand((4, 5), requires_grad=True)
+    g = minitorch.tensor([3.0])
+    view = x.expand(g)
+    assert view.shape == (4, 5)
+    assert view._tensor.strides == (0, 0)
+    assert view._tensor._storage is g._tensor._storage
+
+    (x * 2).mean().view(1).backward()
+    for ind in x._tensor.indices():
+        assert_close(x.grad[ind], 2 / 20)
+
+
+def test_backward_scales_grad():
+    "Backward rules multiply by the incoming gradient, not just a ones gradient."
+    x = minitorch.tensor([0.5, -1.0, 2.0], requires_grad=True)
+    c = minitorch.tensor([1.0, 2.0, 3.0])
+    ((x.exp() + x.sigmoid()) * c).sum().view(1).backward()
+    for i in range(3):
+        s = minitorch.operators.sigmoid(x[i])
+        assert_close(x.grad[i], c[i] * (minitorch.operators.exp(x[i]) + s * (1 - s)))
+
+
+def test_inplace():
+    a = minitorch.tensor_fromlist([[1.0, 2.0], [3.0, 4.0]])
+    storage = a._tensor._storage
+    b = minitorch.tensor([10.0, 20.0])
+    assert a.add_(b) is a
+    a.mul_(2.0).sub_(a * 0.5)
+    assert a._tensor._storage is storage
+    assert a.to_numpy().tolist() == [[11.0, 22.0], [13.0, 24.0]]
+    with pytest.raises(minitorch.IndexingError):
+        b.add_(a)
+    with pytest.raises(minitorch.IndexingError):
+        a.expand(minitorch.tensor([1.0])).add_(1.0)
+
+
+def test_permute_view():
+    t = minitorch.rand((2, 3, 4), requires_grad=True)
+    p = t.permute(2, 0, 1)
+    assert p.shape == (4, 2, 3)
+    assert p._tensor._storage is t._tensor._storage
+    minitorch.grad_check(lambda a: a.permute(2, 0, 1), t)
+
+
+def test_dtype():
+    x = minitorch.tensor_fromlist([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    assert x.dtype == np.float32
+    assert (x * 2.0 - 1).dtype == np.float32
+    assert (x + minitorch.tensor([1.0, 2.0])).dtype == np.float64
+    assert minitorch.zeros((2,), dtype=np.float32).dtype == np.float32
+    assert x.zeros().dtype == np.float32
+    assert minitorch.rand((2,), dtype=np.float32).dtype == np.float32
+
+
+def test_load_mmap(tmp_path):
+    path = tmp_path / "data.bin"
+    values = np.arange(12.0)
+    values.tofile(path)
+    t = minitorch.load_mmap(path, (3, 4))
+    assert isinstance(t._tensor._storage, np.memmap)
+    expected = 2 * values.reshape(3, 4).sum(0, keepdims=True)
+    assert_close((t * 2).sum(0).to_numpy(), expected)
+    with pytest.raises(ValueError):
+        t.add_(1.0)
+
+    t = minitorch.load_mmap(path, (3, 4), mode="r+")
+    t.add_(1.0)
+    del t
+    assert np.fromfile(path).tolist() == (values + 1).tolist()
+
+
+def test_slice():
+    t = minitorch.tensor_fromlist([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    t.requires_grad_(True)
+    assert t[1, 2] == 6.0
+    row = t[1]
+    assert row.shape == (3,)
+    assert np.shares_memory(row._tensor._storage, t._tensor._storage)
+    assert t[:, 1:].to_numpy().tolist() == [[2.0, 3.0], [5.0, 6.0]]
+    assert t.narrow(1, 0, 2).shape == (2, 2)
+    assert t.select(1, 2).to_numpy().tolist() == [3.0, 6.0]
+    minitorch.grad_check(lambda a: a[:, 1:] * a[:, :2], t)
+
+    # in-place ops write through the view
+    t[:, 1].add_(10.0)
+    assert t.to_numpy().tolist() == [[1.0, 12.0, 3.0], [4.0, 15.0, 6.0]]
+
+
+def test_negative_index():
+    "Negative indices count from the end, for values and for views"
+    values = np.arange(6.0).reshape(2, 3)
+    t = minitorch.from_numpy(values)
+    assert t[-1, -1] == values[-1, -1]
+    assert t[0, -3] == values[0, -3]
+    assert t[-1].to_numpy().tolist() == values[-1].tolist()
+    assert t[-2, 1:].to_numpy().tolist() == values[-2, 1:].tolist()
+    assert t[:, -1].to_numpy().tolist() == values[:, -1].tolist()
+    assert minitorch.tensor([1.0, 2.0])[-1] == 2.0
+    with pytest.raises(minitorch.IndexingError):
+        t[-3, 0]
+    with pytest.raises(minitorch.IndexingError):
+        t[-3]
+
+
+def test_numpy_interop():
+    values = np.arange(6.0, dtype=np.float32).reshape(2, 3)
+    t = minitorch.from_numpy(values)
+    assert t.dtype == np.float32 and t.shape == (2, 3)
+    t.add_(1.0)
+    assert values[1, 2] == 6.0
+
+    out = t.permute(1, 0).to_numpy()
+    assert np.shares_memory(out, values)
+    assert out.tolist() == values.T.tolist()
+    assert np.shares_memory(np.asarray(t[:, 1:]), values)
+    assert (np.asarray(t * 2, dtype=np.float64) == 2 * values).all()
+    with pytest.raises(ValueError):
+        np.array(t, dtype=np.float64, copy=False)
+    assert np.shares_memory(np.array(t, copy=False), values)
+    assert not np.shares_memory(np.array(t, copy=True), values)
+
+
+@pytest.mark.parametrize("dtype", [np.float16, np.longdouble, ">f8"])
+def test_from_numpy_dtypes(dtype):
+    "Arrays of dtypes without kernels are copied to float64"
+    backend = minitorch.make_tensor_backend(minitorch.FastOps)
+    values = np.arange(6.0).reshape(2, 3).astype(dtype)
+    t = minitorch.from_numpy(values, backend=backend)
+    assert t.dtype == np.float64
+    assert ((t + t).to_numpy() == 2 * values.astype(np.float64)).all()
+
+
+def test_numpy_keeps_storage():
+    "Arrays keep the storage alive when the tensor moves to another one"
+    t = minitorch.zeros((100, 100))
+    values = np.asarray(t)
+    storage = t._tensor._storage
+    t._tensor = minitorch.TensorData(np.ones(t.size), t.shape)
+    del storage
+    other = minitorch.zeros((100, 100))
+    other._tensor._storage[:] = 7.0
+    assert not np.shares_memory(values, other._tensor._storage)
+    assert not values.any()
+
+
+def test_rand_generator():
+    a = minitorch.rand((3, 4), generator=5)
+    b = minitorch.rand((3, 4), generator=np.random.default_rng(5))
+    assert a.shape == (3, 4)
+    for ind in a._tensor.indices():
+        assert a[ind] == b[ind]
+        assert 0.0 <= a[ind] < 1.0
+
+
 def test_fromlist():
     t = minitorch.tensor_fromlist([[2, 3, 4], [4, 5, 7]])
     t.shape == (2, 3)
@@ -1,3 +1,4 @@
+import numpy as np
 from numpy import array
 import minitorch
 from minitorch.tensor_data import (
@@ -30,6 +31,125 @@ def test_layout():
     assert tensor_data.strides == (4, 2, 1)
 
 
+def test_broadcast_to():
+    "Broadcasting is a view with stride 0 in the broadcast dimensions"
+    data = [0.0, 1.0, 2.0]
+    tensor_data = minitorch.TensorData(data, (3, 1))
+    view = tensor_data.broadcast_to((2, 3, 4))
+    assert view.shape == (2, 3, 4)
+    assert view.strides == (0, 1, 0)
+    assert view._storage is tensor_data._storage
+    assert not view.is_contiguous()
+    for ind in view.indices():
+        assert view.get(ind) == data[ind[1]]
+
+    with pytest.raises(IndexingError):
+        tensor_data.broadcast_to((2, 4))
+
+
+def test_storage_pool():
+    pool = minitorch.StoragePool(max_bytes=2 ** 20, min_size=100)
+    a = pool.zeros(1000)
+    assert a.shape == (1000,) and not a.any()
+    view = a.reshape(10, 100)
+    a[:] = 1.0
+    del a
+    # the reshaped view still uses the buffer
+    assert pool.stats()["bytes_held"] == 0
+    assert pool.stats()["bytes_in_use"] == 1024 * 8  # bucket of 1000
+    del view
+    assert pool.stats()["bytes_held"] == 1024 * 8
+
+    # same bucket, reused and zeroed
+    b = pool.zeros(900)
+    assert pool.stats()["hits"] == 1 and not b.any()
+    assert pool.zeros(10).shape == (10,)
+    assert pool.stats()["misses"] == 1
+
+    del b
+    pool.max_bytes = 0
+    c = pool.zeros(1000)
+    del c
+    assert pool.stats()["misses"] == 1
+    pool.flush()
+    assert pool.stats()["bytes_held"] == 0
+
+
+def test_slice():
+    "Slices are views of the storage from the offset of their first element"
+    tensor_data = minitorch.TensorData([float(i) for i in range(24)], (2, 3, 4))
+    view = tensor_data.slice((1, slice(1, 3)))
+    assert view.shape == (2, 4)
+    assert view.strides == (4, 1)
+    assert view.is_contiguous()
+    assert view._storage.base is tensor_data._storage
+    assert view.get((1, 3)) == 23.0
+
+    view = tensor_data.slice((slice(None), -1, slice(0, 4, 2)))
+    assert view.shape == (2, 2)
+    assert view.strides == (12, 2)
+    assert not view.is_contiguous()
+    assert [view.get(ind) for ind in view.indices()] == [8.0, 20.0, 10.0, 22.0]
+    assert tensor_data.slice((1, 2, 3)).shape == (1,)
+
+    with pytest.raises(IndexingError):
+        tensor_data.slice((2,))
+    with pytest.raises(IndexingError):
+        tensor_data.slice((0, 0, 0, 0))
+    with pytest.raises(IndexingError):
+        tensor_data.slice(slice(None, None, -1))
+
+
+def test_from_numpy():
+    "Arrays with any non-negative strides are used without copying"
+    values = np.arange(24.0).reshape(2, 3, 4)
+    for view in [values, values.transpose(2, 0, 1), values[:, 1:, ::2], values[1, 2]]:
+        tensor_data = minitorch.TensorData.from_numpy(view)
+        assert tensor_data.shape == view.shape
+        assert np.shares_memory(tensor_data._storage, values)
+        for ind in tensor_data.indices():
+            assert tensor_data.get(ind) == view[ind]
+        out = tensor_data.to_numpy()
+        assert np.shares_memory(out, values)
+        assert (out == view).all()
+
+    # copies
+    assert minitorch.TensorData.from_numpy(np.arange(3)).dtype == np.float64
+    # dtypes the kernels do not support
+    for dtype in [np.float16, np.longdouble, ">f8"]:
+        other = values.astype(dtype)
+        tensor_data = minitorch.TensorData.from_numpy(other)
+        assert tensor_data.dtype == np.float64
+        assert not np.shares_memory(tensor_data._storage, other)
+        assert (tensor_data.to_numpy() == values).all()
+    reverse = values[:, ::-1]
+    assert not np.shares_memory(
+        minitorch.TensorData.from_numpy(reverse)._storage, values
+    )
+
+    broadcast = minitorch.TensorData([1.0, 2.0], (2,)).broadcast_to((3, 2))
+    assert (broadcast.to_numpy() == [[1.0, 2.0]] * 3).all()
+    assert not broadcast.to_numpy().flags.writeable
+
+
+def test_from_file(tmp_path):
+    "Storage is a read-only memory map of the file"
+    path = tmp_path / "data.bin"
+    (array(range(24), dtype="float32") * 0.5).tofile(path)
+    tensor_data = minitorch.TensorData.from_file(path, (2, 3, 4), "float32")
+    assert tensor_data.dtype == "float32"
+    assert tensor_data.get((1, 2, 3)) == 11.5
+    view = tensor_data.permute(2, 0, 1)
+    assert view._storage is tensor_data._storage
+    assert view.get((3, 1, 2)) == 11.5
+    with pytest.raises(ValueError):
+        tensor_data.set((0, 0, 0), 1.0)
+
+    # the second row, mapped from its position in the file
+    row = minitorch.TensorData.from_file(path, (3, 4), "float32", offset=12 * 4)
+    assert row.get((2, 3)) == 11.5
+
+
 @pytest.mark.task2_1
 @given(tensor_data())
 def test_enumeration(tensor_data):
@@ -1,7 +1,10 @@
+import itertools
+import numba
+import numpy as np
 import minitorch
 import pytest
 from hypothesis import given
-import numba
+import numba.cuda
 from hypothesis.strategies import floats, integers, lists, data, permutations
 from .strategies import tensors, shaped_tensors, assert_close
 
@@ -80,6 +83,194 @@ def test_two_args(fn, backend, data):
         )
 
 
+@pytest.mark.task3_1
+def test_layouts():
+    "Matching layouts take the flat path, transposed ones the indexed path."
+    a = minitorch.tensor_fromlist([[1.0, 2.0], [3.0, 4.0]], backend=FastTensorBackend)
+    at = a._new(a._tensor.permute(1, 0))
+    for t in [a, at]:
+        t2 = -t
+        t3 = t + a
+        for ind in t2._tensor.indices():
+            assert_close(t2[ind], -t[ind])
+            assert_close(t3[ind], t[ind] + a[ind])
+
+
+add_reduce = minitorch.FastOps.reduce(minitorch.operators.add)
+max_reduce = minitorch.FastOps.reduce(minitorch.operators.max, -1e9)
+
+
+@pytest.mark.task3_1
+@given(tensors(backend=FastTensorBackend))
+def test_reduce_dims(t1):
+    "Reduce every subset of dims, including the reduction to a single value."
+    a = t1.to_numpy()
+    for r in range(1, t1.dims + 1):
+        for dims in itertools.combinations(range(t1.dims), r):
+            c1 = add_reduce(t1, list(dims)).to_numpy()
+            c2 = max_reduce(t1, list(dims)).to_numpy()
+            assert_close(c1, a.sum(axis=dims, keepdims=True))
+            assert_close(c2, a.max(axis=dims, keepdims=True))
+
+
+@pytest.mark.task3_1
+def test_reduce_empty():
+    "Reducing no elements gives the start value, like TensorOps."
+    for backend in [minitorch.TensorFunctions, FastTensorBackend]:
+        total = minitorch.zeros((0,), backend=backend).sum()
+        assert total.to_numpy().tolist() == [0.0]
+    t = minitorch.rand((3, 4), backend=FastTensorBackend)
+    assert_close(add_reduce(t[1:1], [0]).to_numpy(), np.zeros((1, 4)))
+    assert_close(max_reduce(t[:, 2:2], [1]).to_numpy(), np.full((3, 1), -1e9))
+    assert_close(add_reduce(t[:, 2:2], [0, 1]).to_numpy(), np.zeros((1, 1)))
+
+
+def softplus(x):
+    return minitorch.operators.log(1.0 + minitorch.operators.exp(x))
+
+
+def softplus_back(x, d):
+    return minitorch.operators.sigmoid(x) * d
+
+
+softplus_map = minitorch.FastOps.map(softplus)
+softplus_back_zip = minitorch.FastOps.zip(softplus_back)
+
+
+@pytest.mark.task3_1
+@given(tensors(backend=FastTensorBackend))
+def test_fused(t1):
+    "Composed scalar functions are compiled into one kernel."
+    t2 = softplus_map(t1)
+    t3 = softplus_back_zip(t1, t1)
+    for ind in t1._tensor.indices():
+        assert_close(t2[ind], softplus(t1[ind]))
+        assert_close(t3[ind], softplus_back(t1[ind], t1[ind]))
+
+
+@pytest.mark.task3_2
+def test_out():
+    "zip and matrix_multiply fill in a given output tensor."
+    a = minitorch.rand((2, 3, 4), backend=FastTensorBackend)
+    b = minitorch.rand((4, 5), backend=FastTensorBackend)
+    out = minitorch.zeros((2, 3, 5), backend=FastTensorBackend)
+    assert minitorch.FastOps.matrix_multiply(a, b, out=out) is out
+    assert_close(out.to_numpy(), a.to_numpy() @ b.to_numpy())
+
+    c = minitorch.rand((4,), backend=FastTensorBackend)
+    expected = a.to_numpy() * c.to_numpy()
+    assert FastTensorBackend._mul_zip(a, c, out=a) is a
+    assert_close(a.to_numpy(), expected)
+
+
+@pytest.mark.task3_1
+def test_kernel_cache():
+    "Kernels are created once per function and keyed by the function name."
+    fast_ops = minitorch.fast_ops
+    k1 = fast_ops.kernel(fast_ops.tensor_reduce, minitorch.operators.add)
+    k2 = fast_ops.kernel(fast_ops.tensor_reduce, minitorch.operators.add)
+    assert k1 is k2
+    assert k1._cache.__class__.__name__ == "FunctionCache"
+    fn = fast_ops.jit_fn(minitorch.operators.add)
+    assert fn._uuid.startswith("minitorch:minitorch.operators.add:")
+    minitorch.FastOps.warmup()
+    assert k1.signatures
+
+
+@pytest.mark.task3_1
+def test_kernel_cache_code():
+    "The key of cached kernels changes with the code of the scalar functions."
+    fast_ops = minitorch.fast_ops
+
+    def uuids(neg_body):
+        # a module with the same names and new code, e.g. an edited operators.py
+        namespace = {"__name__": "edited_operators"}
+        exec(f"def neg(x):\n    return {neg_body}\n", namespace)
+        exec("def neg_twice(x):\n    return neg(neg(x))\n", namespace)
+        return [fast_ops.jit_fn(namespace[f])._uuid for f in ["neg", "neg_twice"]]
+
+    neg, neg_twice = uuids("-x")
+    assert uuids("-x") == [neg, neg_twice]
+    edited, edited_twice = uuids("-x + 100.0")
+    assert edited != neg
+    # through the call of the edited function
+    assert edited_twice != neg_twice
+
+
+@pytest.mark.task3_1
+def test_kernel_cache_helpers(monkeypatch):
+    "The key of cached kernels changes with the helpers of tensor_data."
+    fast_ops = minitorch.fast_ops
+
+    def uuid():
+        namespace = {"__name__": "operators"}
+        exec("def neg(x):\n    return -x\n", namespace)
+        return fast_ops.jit_fn(namespace["neg"])._uuid
+
+    original = uuid()
+    assert uuid() == original
+    # an edited tensor_data.py, broadcast_index always writes 0
+    namespace = {}
+    exec(
+        "def broadcast_index(big_index, big_shape, shape, out_index):\n"
+        "    for i in range(len(shape)):\n"
+        "        out_index[i] = 0\n",
+        namespace,
+    )
+    edited = numba.njit(inline="always")(namespace["broadcast_index"])
+    monkeypatch.setattr(
+        fast_ops, "_HELPERS", (fast_ops.count, fast_ops.index_to_position, edited)
+    )
+    assert uuid() != original
+
+
+@given(data())
+@pytest.mark.parametrize("backend", backend_tests)
+def test_slice(backend, data):
+    "Kernels read and write views that use part of their storage."
+    t = data.draw(tensors(backend=backend, shape=(4, 5)))
+    n = t.to_numpy()
+    for key in [(slice(1, 3),), (slice(None), slice(1, 4)), (2,), (slice(0, 4, 2), 3)]:
+        view = t[key]
+        assert_close(view.to_numpy(), n[key])
+        assert_close((view + view).to_numpy(), 2 * n[key])
+        assert_close(view.sigmoid().to_numpy(), 1 / (1 + np.exp(-n[key])))
+        assert_close(view.sum().to_numpy(), n[key].sum(keepdims=True).reshape(1))
+        assert_close(view.sum(0).to_numpy(), n[key].sum(0, keepdims=True))
+
+    out = t.zeros()
+    out[1:3, 1:4].add_(t[0:2, 0:3])
+    expected = np.zeros((4, 5))
+    expected[1:3, 1:4] = n[0:2, 0:3]
+    assert_close(out.to_numpy(), expected)
+    minitorch.grad_check(lambda a: a[1:3, 0:4:2] * a[0:2, 1::2], t)
+
+
+@pytest.mark.parametrize("backend", backend_tests)
+def test_float32(backend):
+    "float32 tensors stay float32 through forward and backward."
+    x = minitorch.rand((3, 4), backend=backend, requires_grad=True, dtype=np.float32)
+    w = minitorch.rand((4, 2), backend=backend, requires_grad=True, dtype=np.float32)
+    out = ((x @ w).sigmoid() * 2.0 + 1).log().relu()
+    assert out.dtype == np.float32
+    assert out.sum(0).dtype == np.float32
+    out.sum().view(1).backward()
+    assert x.grad.dtype == np.float32
+    assert w.grad.dtype == np.float32
+    expected = np.log(2 / (1 + np.exp(-(x.to_numpy() @ w.to_numpy()))) + 1)
+    assert_close(out.to_numpy(), expected)
+
+    # float32 with float64 promotes, the gradients keep the dtype of the inputs
+    b = minitorch.rand((2,), backend=backend, requires_grad=True)
+    y = x @ w + b
+    assert y.dtype == np.float64
+    x.zero_grad_()
+    y.sum().view(1).backward()
+    assert x.grad.dtype == np.float32
+    assert b.grad.dtype == np.float64
+    minitorch.FastOps.warmup((np.float32,))
+
+
 @given(data())
 @pytest.mark.parametrize("fn", one_arg)
 @pytest.mark.parametrize("backend", backend_tests)